@@ -0,0 +1,424 @@
+""" AVL Tree stored in parallel arrays.
+
+Nodes are indices into parallel arrays of keys, items, left and right
+children, heights and sub-tree sizes, rather than linked node objects.
+Keys and items are kept in Python lists, and the links, heights and sizes
+in typed arrays of machine integers, so a node costs a fixed number of
+bytes and is not an object the garbage collector has to track. The links
+and sizes take 4 bytes each, and the heights, which stay below 100 for any
+tree that fits in memory, a single byte. (ArrayR is
+not used for the keys and items, as ctypes keeps an extra dictionary
+entry for every reference stored in it.)
+Index 0 is an empty sentinel node (NIL) with height and size 0, so that
+the children of a leaf need no special case. Deleted slots are kept on a
+free list, linked through their left child, and reused by insertions.
+"""
+
+__docformat__ = 'reStructuredText'
+
+from array import array
+from typing import TypeVar, Generic
+from avl import AVLTree, KEY_TYPE_ERROR, DUPLICATE_ERROR
+from node import TreeNode
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+NIL = 0
+
+# Type codes of the arrays of links and sizes (4 byte ints) and of heights (1 byte ints)
+INDEX_TYPE = 'i'
+HEIGHT_TYPE = 'b'
+
+
+class ArrayAVLTreeIterator:
+    """ In-order iterator for the array-backed AVL tree.
+        Performs stack-based traversal, with the stack kept in a Python list.
+    """
+
+    def __init__(self, tree: 'ArrayAVLTree') -> None:
+        """ Iterator initialiser. """
+        self.tree = tree
+        self.stack = []
+        self.current = tree.root
+
+    def __iter__(self) -> 'ArrayAVLTreeIterator':
+        """ Standard __iter__() method for initialisers. Returns itself. """
+        return self
+
+    def __next__(self) -> K:
+        """ The main body of the iterator.
+            Returns keys of the tree one by one respecting the in-order.
+        """
+        left = self.tree.left
+        while self.current != NIL:
+            self.stack.append(self.current)
+            self.current = left[self.current]
+
+        if len(self.stack) == 0:
+            raise StopIteration
+
+        result = self.stack.pop()
+        self.current = self.tree.right[result]
+        return self.tree.keys[result]
+
+
+class ArrayAVLTree(Generic[K, I]):
+    """ Self-balancing binary search tree with the same interface as avl.AVLTree,
+        storing its nodes in parallel arrays.
+
+        attributes:
+            keys, items: list of the key and item of each node
+            left, right: array of the index of the children of each node, NIL for none
+            height, size: array of the height and sub-tree size of each node
+            root: index of the root node, NIL when empty
+            length: number of nodes in the tree
+            free: index of the first free slot, NIL when there are none
+            used: slots below this index have been handed out at least once
+    """
+    MIN_CAPACITY = 16
+
+    def __init__(self, capacity: int = MIN_CAPACITY) -> None:
+        """
+            Initialises an empty tree with room for capacity nodes.
+            :complexity: O(capacity)
+        """
+        capacity = max(self.MIN_CAPACITY, capacity) + 1  # slot 0 is the NIL sentinel
+        self.keys = [None] * capacity
+        self.items = [None] * capacity
+        self.left = array(INDEX_TYPE, bytes(capacity * array(INDEX_TYPE).itemsize))
+        self.right = array(INDEX_TYPE, self.left)
+        self.height = array(HEIGHT_TYPE, bytes(capacity))
+        self.size = array(INDEX_TYPE, self.left)
+        self.root = NIL
+        self.length = 0
+        self.free = NIL
+        self.used = 1
+
+    def is_empty(self) -> bool:
+        """
+            Checks to see if the tree is empty
+            :complexity: O(1)
+        """
+        return self.root == NIL
+
+    def __len__(self) -> int:
+        """
+            Returns the number of nodes in the tree.
+            :complexity: O(1)
+        """
+        return self.length
+
+    def __contains__(self, key: K) -> bool:
+        """
+            Checks to see if the key is in the tree
+            :complexity: see __getitem__(self, key: K) -> I
+        """
+        return self.find(key) != NIL
+
+    def __iter__(self) -> ArrayAVLTreeIterator:
+        """ Create an in-order iterator. """
+        return ArrayAVLTreeIterator(self)
+
+    def __getitem__(self, key: K) -> I:
+        """
+            Attempts to get an item in the tree, it uses the Key to attempt to find it
+            :raises KeyError: if the key is not in the tree
+            :complexity: O(CompK * log(N)) where N is the number of nodes and CompK is the
+                         complexity of comparing the keys
+        """
+        index = self.find(key)
+        if index == NIL:
+            raise KeyError('Key not found: {0}'.format(key))
+        return self.items[index]
+
+    def find(self, key: K) -> int:
+        """
+            Returns the index of the node with the given key, NIL if there is none.
+            :complexity: O(CompK * log(N)), see __getitem__
+        """
+        keys = self.keys
+        current = self.root
+        while current != NIL:
+            current_key = keys[current]
+            if key == current_key:
+                return current
+            elif key < current_key:
+                current = self.left[current]
+            else:
+                current = self.right[current]
+        return NIL
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            Inserts a new node into the tree, see insert_aux. As for avl.AVLTree, a key that is
+            not a real number or is already in the tree is reported with AVLTree.report, not raised.
+            :complexity: O(CompK * log(N)), amortised over growing the arrays
+        """
+        try:
+            if AVLTree.is_valid_key(key):
+                self.insert_aux(key, item)
+            else:
+                raise TypeError(KEY_TYPE_ERROR)
+        except Exception as e:
+            AVLTree.report(e)
+
+    def insert_aux(self, key: K, item: I) -> None:
+        """
+            Called by __setitem__(self, key: K, item: I).
+            Inserts a new node into the tree, using the key as sorting criteria, then
+            walks back up the path from the root, updating heights and sizes and rebalancing.
+            :raises ValueError: if key is a duplicate value
+            :complexity: O(CompK * log(N)), amortised over growing the arrays
+        """
+        path = []
+        current = self.root
+        while current != NIL:
+            path.append(current)
+            current_key = self.keys[current]
+            if key < current_key:
+                current = self.left[current]
+            elif key > current_key:
+                current = self.right[current]
+            else:
+                raise ValueError(DUPLICATE_ERROR)
+
+        new_node = self.allocate(key, item)
+        self.length += 1
+        if len(path) == 0:
+            self.root = new_node
+            return
+        if key < self.keys[path[-1]]:
+            self.left[path[-1]] = new_node
+        else:
+            self.right[path[-1]] = new_node
+        self.root = self.rebalance_path(path)
+
+    def __delitem__(self, key: K) -> None:
+        """
+            Deletes the node with the given key. A node with two children takes the key
+            and item of its successor, and the successor's node is removed instead.
+            The slot of the node removed goes onto the free list.
+            :raises ValueError: if the key is not in the tree
+            :complexity: O(CompK * log(N))
+        """
+        path = []
+        current = self.root
+        while current != NIL and key != self.keys[current]:
+            path.append(current)
+            current = self.left[current] if key < self.keys[current] else self.right[current]
+        if current == NIL:
+            raise ValueError('Deleting non-existent item')
+
+        if self.left[current] != NIL and self.right[current] != NIL:
+            path.append(current)
+            succ = self.right[current]
+            while self.left[succ] != NIL:
+                path.append(succ)
+                succ = self.left[succ]
+            self.keys[current] = self.keys[succ]
+            self.items[current] = self.items[succ]
+            current = succ
+
+        child = self.left[current] if self.left[current] != NIL else self.right[current]
+        if len(path) == 0:
+            self.root = child
+        else:
+            parent = path[-1]
+            if self.left[parent] == current:
+                self.left[parent] = child
+            else:
+                self.right[parent] = child
+            self.root = self.rebalance_path(path)
+        self.release(current)
+        self.length -= 1
+
+    def allocate(self, key: K, item: I) -> int:
+        """
+            Returns a slot holding a new leaf with the given key and item, taking it from
+            the free list if possible, and doubling the arrays if they are full.
+            :complexity: O(1) amortised, O(N) when the arrays are doubled
+        """
+        if self.free != NIL:
+            index = self.free
+            self.free = self.left[index]
+        else:
+            if self.used == len(self.keys):
+                self.resize(2 * len(self.keys))
+            index = self.used
+            self.used += 1
+        self.keys[index] = key
+        self.items[index] = item
+        self.left[index] = NIL
+        self.right[index] = NIL
+        self.height[index] = 1
+        self.size[index] = 1
+        return index
+
+    def release(self, index: int) -> None:
+        """
+            Puts a slot back on the free list, dropping the references to its key and item.
+            :complexity: O(1)
+        """
+        self.keys[index] = None
+        self.items[index] = None
+        self.left[index] = self.free
+        self.free = index
+
+    def resize(self, capacity: int) -> None:
+        """
+            Grows every array to the given capacity.
+            :complexity: O(capacity) when the arrays have to be copied, amortised O(1) per slot
+        """
+        self.keys.extend([None] * (capacity - len(self.keys)))
+        self.items.extend([None] * (capacity - len(self.items)))
+        for links in (self.left, self.right, self.height, self.size):
+            links.frombytes(bytes((capacity - len(links)) * links.itemsize))
+
+    def copy(self) -> 'ArrayAVLTree[K, I]':
+        """
+            Returns a snapshot of the tree: an independent tree with the same keys and items,
+            made by copying each array in one go.
+            :complexity: O(C) where C is the capacity of the arrays
+        """
+        tree = ArrayAVLTree(0)
+        tree.keys = self.keys[:]
+        tree.items = self.items[:]
+        tree.left = array(INDEX_TYPE, self.left)
+        tree.right = array(INDEX_TYPE, self.right)
+        tree.height = array(HEIGHT_TYPE, self.height)
+        tree.size = array(INDEX_TYPE, self.size)
+        tree.root = self.root
+        tree.length = self.length
+        tree.free = self.free
+        tree.used = self.used
+        return tree
+
+    def update(self, current: int) -> None:
+        """
+            Recomputes the height and size of a node from its children.
+            :complexity: O(1)
+        """
+        left = self.left[current]
+        right = self.right[current]
+        self.height[current] = max(self.height[left], self.height[right]) + 1
+        self.size[current] = self.size[left] + self.size[right] + 1
+
+    def left_rotate(self, current: int) -> int:
+        """
+            Perform left rotation of the sub-tree rooted at current, see avl.AVLTree.left_rotate.
+            :pre: current has a right child
+            :complexity: O(1)
+            :returns: the new root, the right child of current
+        """
+        child = self.right[current]
+        self.right[current] = self.left[child]
+        self.left[child] = current
+        self.update(current)
+        self.update(child)
+        return child
+
+    def right_rotate(self, current: int) -> int:
+        """
+            Perform right rotation of the sub-tree rooted at current, see avl.AVLTree.right_rotate.
+            :pre: current has a left child
+            :complexity: O(1)
+            :returns: the new root, the left child of current
+        """
+        child = self.left[current]
+        self.left[current] = self.right[child]
+        self.right[child] = current
+        self.update(current)
+        self.update(child)
+        return child
+
+    def rebalance(self, current: int) -> int:
+        """
+            Rebalances the sub-tree rooted at current by one or two rotations if its
+            balance factor has reached 2 or -2.
+            :complexity: O(1)
+            :returns: the new root of the sub-tree
+        """
+        height = self.height
+        balance = height[self.right[current]] - height[self.left[current]]
+        if balance >= 2:
+            child = self.right[current]
+            if height[self.left[child]] > height[self.right[child]]:
+                self.right[current] = self.right_rotate(child)
+            return self.left_rotate(current)
+        if balance <= -2:
+            child = self.left[current]
+            if height[self.right[child]] > height[self.left[child]]:
+                self.left[current] = self.left_rotate(child)
+            return self.right_rotate(current)
+        return current
+
+    def rebalance_path(self, path: list) -> int:
+        """
+            Walks a path of nodes back up from its deepest node, updating the height and
+            size of each node and rebalancing the sub-tree it roots.
+            :pre: path[i + 1] is a child of path[i]
+            :complexity: O(P) where P is the length of the path
+            :returns: the new root of the sub-tree rooted at path[0]
+        """
+        subtree = NIL
+        for i in range(len(path) - 1, -1, -1):
+            current = path[i]
+            self.update(current)
+            subtree = self.rebalance(current)
+            if i > 0 and subtree != current:
+                parent = path[i - 1]
+                if self.left[parent] == current:
+                    self.left[parent] = subtree
+                else:
+                    self.right[parent] = subtree
+        return subtree
+
+    def select(self, rank: int) -> int:
+        """
+            Returns the index of the node holding the rank-th smallest key, rank=1 being the smallest.
+            :raises IndexError: if rank is out of range
+            :complexity: O(log(N))
+        """
+        if rank < 1 or rank > self.length:
+            raise IndexError('Rank out of range: {0}'.format(rank))
+        current = self.root
+        while True:
+            left_size = self.size[self.left[current]]
+            if rank <= left_size:
+                current = self.left[current]
+            elif rank == left_size + 1:
+                return current
+            else:
+                rank -= left_size + 1
+                current = self.right[current]
+
+    def rank(self, key: K) -> int:
+        """
+            Returns the position of key in the sorted order of the keys, the smallest having rank 1.
+            :raises KeyError: if key is not in the tree
+            :complexity: O(CompK * log(N))
+        """
+        current = self.root
+        rank = 0
+        while current != NIL:
+            if key < self.keys[current]:
+                current = self.left[current]
+            elif key > self.keys[current]:
+                rank += self.size[self.left[current]] + 1
+                current = self.right[current]
+            else:
+                return rank + self.size[self.left[current]] + 1
+        raise KeyError('Key not found: {0}'.format(key))
+
+    def kth_largest(self, k: int) -> TreeNode:
+        """
+            Returns the kth largest element in the tree, k=1 being the largest, as a
+            TreeNode holding its key and item. The TreeNode is a copy, changing it does
+            not change the tree. Returns None if k is out of range.
+            :complexity: O(log(N)), see select(rank)
+        """
+        if k < 1 or k > self.length:
+            return None
+        index = self.select(self.length - k + 1)
+        return TreeNode(self.keys[index], self.items[index])
@@ -1,72 +1,158 @@
 """ AVL Tree implemented on top of the standard BST. """
 
+from __future__ import annotations
+
 __author__ = 'Alexey Ignatiev'
 __docformat__ = 'reStructuredText'
 
+import gc
 from bst import BinarySearchTree
+from operator import itemgetter
 from typing import TypeVar, Generic
 from node import AVLTreeNode
 
 K = TypeVar('K')
 I = TypeVar('I')
 
+# Types of the keys the tree accepts, and the messages of the errors reported on insertion,
+# shared by every way of inserting
+KEY_TYPES = frozenset((int, float))
+KEY_TYPE_ERROR = 'Key must be a real number'
+DUPLICATE_ERROR = 'Inserting duplicate item'
+
 
 class AVLTree(BinarySearchTree, Generic[K, I]):
     """ Self-balancing binary search tree using rebalancing by sub-tree
         rotations of Adelson-Velsky and Landis (AVL).
+
+        In multimap mode the tree may hold a key any number of times. An equal key is
+        inserted after the ones already there, so equal keys keep their insertion order,
+        and every node counts once in the sub-tree sizes used by select and rank.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, multimap: bool = False) -> None:
         """
             Initialises an empty Binary Search Tree
+            :param multimap: allow duplicate keys rather than rejecting them
             :complexity: O(1)
         """
         BinarySearchTree.__init__(self)
+        self.multimap = multimap
 
     def __setitem__(self, key: K, item: I) -> None:
         """
         Overwrite magic method to insert new node into binary tree.
-        Calls insert_aux, a recursive helper function. See insert_aux for more indepth explanation
+        Calls insert_aux, an iterative helper function. See insert_aux for more indepth explanation
         :complexity: Best O(1), if tree is empty. Worst O(log(N)), where N is the number of elements
                         of the balanced tree
         :return: Updated root of binary tree post-insertion and post-rebalancing
         """
         try:
-            if type(key) == int or type(key) == float:
+            if self.is_valid_key(key):
                 self.root = self.insert_aux(self.root, key, item)
             else:
-                raise TypeError("Ket must be a real number")
+                raise TypeError(KEY_TYPE_ERROR)
         except Exception as e:
-            print(f"Error {type(e)}: {e}")
+            self.report(e)
+
+    @staticmethod
+    def is_valid_key(key: K) -> bool:
+        """
+        Checks that key is a real number, the only keys the tree accepts.
+        :complexity: O(1)
+        """
+        return type(key) in KEY_TYPES
+
+    @staticmethod
+    def report(error: Exception) -> None:
+        """
+        Prints an error met on insertion. Every way of inserting reports its errors here.
+        :complexity: O(1)
+        """
+        print(f"Error {type(error)}: {error}")
 
     def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
         """
             Called by __setitem__(self, key: K, item: I).
-            Recursively inserts a new node into binary tree, using the key as sorting criteria.
-            After insertion, calls rebalance to ensure tree balance factor is maintained.
+            Inserts a new node into binary tree, using the key as sorting criteria.
+            Descends iteratively from current, keeping the path of nodes visited on a stack.
+            After insertion, walks back up the path, updating heights and sizes and calling
+            rebalance on every node to ensure tree balance factor is maintained.
             :param current: the root of the tree or subtree to insert the new node into
             :param key: the key of the node, used to determine where to insert
             :param item: the data/value of the node
             :pre: key is a real number for purposes of gt/lt/eq operations. Checked in __setitem__ method
-            :post: tree is rebalanced and heights are updated. If key was duplicate, don't insert.
-            :raises ValueError: if key is a duplicate value
-            :complexity: Best and worst O(1). See __setitem__ for complexity of full recursive call
-            :returns: TreeNode. At end of recursion, returns updated root of binary tree.
-        """
-        if current is None:  # base case: at the leaf
-            current = AVLTreeNode(key, item)
-            self.length += 1
-            return current
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-        else:  # key == current.key. Duplication should cause error
-            raise ValueError('Inserting duplicate item')
-
-        # Finally, update heights and rebalance current root after insertion completed (postorder processing)
-        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
-        return self.rebalance(current)  # return new root of rebalanced tree. O(1)
+            :post: tree is rebalanced and heights are updated. If key was duplicate, don't insert,
+                   unless in multimap mode, where it goes after the nodes with an equal key.
+            :raises ValueError: if key is a duplicate value, and the tree is not a multimap
+            :complexity: Best O(1), if tree is empty. Worst O(log(N)), where N is the number of elements
+                            of the balanced tree
+            :returns: TreeNode. The updated root of the tree or subtree.
+        """
+        path = []
+        parent = current
+        while parent is not None:
+            path.append(parent)
+            if key < parent.key:
+                parent = parent.left
+            elif key > parent.key or self.multimap:
+                parent = parent.right
+            else:  # key == parent.key. Duplication should cause error
+                raise ValueError(DUPLICATE_ERROR)
+
+        new_node = AVLTreeNode(key, item)
+        self.length += 1
+        if len(path) == 0:  # empty sub-tree, the new node is its root
+            return new_node
+        if key < path[-1].key:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+
+        # Finally, update heights and sizes and rebalance the path after insertion completed (postorder processing)
+        return self.rebalance_path(path)
+
+    def rebalance_path(self, path: list) -> AVLTreeNode:
+        """
+            Walks a path of nodes back up from its deepest node, updating the height and
+            size of each node and rebalancing the sub-tree it roots. A rotation below a
+            node is attached back to that node before moving up to it.
+            Once a node keeps its height without a rotation, the heights above it cannot
+            change either, so only the sizes are updated from there on.
+            :pre: path[i + 1] is a child of path[i], and the sub-trees below the path are balanced
+            :complexity: O(P) where P is the length of the path
+            :returns: the new root of the sub-tree rooted at path[0]
+        """
+        subtree = None
+        settled = False
+        for i in range(len(path) - 1, -1, -1):
+            current = path[i]
+            left = current.left
+            right = current.right
+            left_size = left.size if left is not None else 0
+            right_size = right.size if right is not None else 0
+            current.size = left_size + right_size + 1
+            if settled:
+                subtree = current
+                continue
+
+            left_height = left.height if left is not None else 0
+            right_height = right.height if right is not None else 0
+            height = max(left_height, right_height) + 1
+            if -2 < right_height - left_height < 2:  # balanced, no rotation needed
+                settled = height == current.height
+                current.height = height
+                subtree = current
+            else:
+                current.height = height
+                subtree = self.rebalance(current)  # new root of rebalanced sub-tree. O(1)
+                if i > 0:
+                    parent = path[i - 1]
+                    if parent.left is current:
+                        parent.left = subtree
+                    else:
+                        parent.right = subtree
+        return subtree
 
     def get_height(self, current: AVLTreeNode) -> int:
         """
@@ -79,6 +165,17 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             return current.height
         return 0
 
+    def get_size(self, current: AVLTreeNode) -> int:
+        """
+            Get the number of nodes in the sub-tree rooted at current.
+            Return current.size if current is not None. Otherwise, return 0.
+            :complexity: O(1)
+        """
+
+        if current is not None:
+            return current.size
+        return 0
+
     def get_balance(self, current: AVLTreeNode) -> int:
         """
             Compute the balance factor for the current sub-tree as the value
@@ -93,35 +190,48 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
     def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
         """
             Attempts to delete an item from the tree, it uses the Key to
-            determine the node to delete. After deletion,
-            performs sub-tree rotation whenever it becomes unbalanced.
+            determine the node to delete (see BinarySearchTree.delete_path). After deletion,
+            walks back up the path to the node removed, performing sub-tree rotation
+            whenever it becomes unbalanced.
+            In multimap mode the first node with the key, in insertion order, is deleted.
             returns the new root of the subtree.
+            :raises ValueError: if the key is not in the tree
+            :complexity: O(log(N)) best and worst, where N is the number of elements of the balanced tree
         """
-        if current is None:  # key not found
-            raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
-            current.key  = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
-
-        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
-        return self.rebalance(current)
+        path, child = self.delete_path(current, key, self.multimap)
+        if len(path) == 0:  # current itself was removed
+            return child
+        return self.rebalance_path(path)
+
+    def delete_rank(self, rank: int) -> I:
+        """
+            Deletes the node holding the rank-th smallest key, rank=1 being the smallest,
+            and returns its item. In multimap mode this singles out one node among equal keys.
+            Descends from the root using the sub-tree sizes, as select does, then removes the
+            node and rebalances the path, as delete_aux does.
+            :raises IndexError: if rank is out of range
+            :complexity: O(log(N)) best and worst, where N is the number of elements of the balanced tree
+        """
+        if rank < 1 or rank > len(self):
+            raise IndexError('Rank out of range: {0}'.format(rank))
+
+        path = []
+        current = self.root
+        while True:
+            left_size = self.get_size(current.left)
+            if rank == left_size + 1:
+                break
+            path.append(current)
+            if rank <= left_size:
+                current = current.left
+            else:
+                rank -= left_size + 1
+                current = current.right
+
+        item = current.item
+        child = self.unlink(path, current)
+        self.root = child if len(path) == 0 else self.rebalance_path(path)
+        return item
 
     def left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
         """
@@ -152,9 +262,11 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             center = child.left
             child.left = current
             current.right = center
-            #  Update height of freshly rotated nodes. Critical for rebalancing
+            #  Update height and size of freshly rotated nodes. Critical for rebalancing
             current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
             child.height = 1 + max(self.get_height(child.left), self.get_height(child.right))
+            current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
+            child.size = 1 + self.get_size(child.left) + self.get_size(child.right)
 
             return child
 
@@ -190,9 +302,11 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             center = child.right
             child.right = current
             current.left = center
-            #  Update height of freshly rotated nodes. Critical for rebalancing
+            #  Update height and size of freshly rotated nodes. Critical for rebalancing
             current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
             child.height = 1 + max(self.get_height(child.left), self.get_height(child.right))
+            current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
+            child.size = 1 + self.get_size(child.left) + self.get_size(child.right)
 
             return child
 
@@ -208,6 +322,8 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             - a combination of left + right rotate
             - a combination of right + left rotate
             returns the new root of the subtree.
+            Only the sub-tree is changed: attaching its new root, to a parent or as
+            self.root, is left to the caller.
         """
         if self.get_balance(current) >= 2:
             child = current.right
@@ -221,58 +337,357 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
                 current.left = self.left_rotate(child)
             return self.right_rotate(current)
 
-        self.root = current
         return current
 
-    def kth_largest(self, k: int) -> AVLTreeNode:
+    def validate(self) -> None:
         """
-        Returns the kth largest element in the tree.
-        k=1 would return the largest.
+        Checks the invariants of the tree, for debugging and testing: keys in order (strictly
+        increasing unless in multimap mode), the height and size of every node equal to those
+        computed from its children, every balance factor between -1 and 1, and length equal
+        to the number of nodes. The tree is not modified.
+        :raises ValueError: describing the first invariant found broken
+        :complexity: O(N) best and worst, where N is the number of nodes
         """
+        previous = None
+        count = 0
+        stack = []
         current = self.root
-        largest = None
+        while current is not None or len(stack) > 0:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            if count > 0 and not (previous < current.key or self.multimap and previous == current.key):
+                raise ValueError('Key {0} out of order after {1}'.format(current.key, previous))
+            left_height = self.get_height(current.left)
+            right_height = self.get_height(current.right)
+            if current.height != 1 + max(left_height, right_height):
+                raise ValueError('Wrong height {0} at key {1}'.format(current.height, current.key))
+            if current.size != 1 + self.get_size(current.left) + self.get_size(current.right):
+                raise ValueError('Wrong size {0} at key {1}'.format(current.size, current.key))
+            if not -2 < right_height - left_height < 2:
+                raise ValueError('Unbalanced at key {0}'.format(current.key))
+            previous = current.key
+            count += 1
+            current = current.right
+        if count != len(self):
+            raise ValueError('Length {0} but {1} nodes'.format(len(self), count))
+
+    def select(self, rank: int) -> AVLTreeNode:
+        """
+        Returns the node holding the rank-th smallest key in the tree.
+        rank=1 would return the smallest.
+        Descends from the root using the sub-tree sizes, going left when the
+        left sub-tree holds at least rank nodes and right otherwise.
+        :pre: 1 <= rank <= len(self)
+        :raises IndexError: if rank is out of range
+        :complexity: O(log(N)) best and worst, where N is the number of nodes in
+                        the balanced tree
+        """
+        if rank < 1 or rank > self.get_size(self.root):
+            raise IndexError('Rank out of range: {0}'.format(rank))
 
-        # count variable to keep count of visited Nodes
-        count = 0
+        current = self.root
+        while current is not None:
+            left_size = self.get_size(current.left)
+            if rank <= left_size:
+                current = current.left
+            elif rank == left_size + 1:
+                return current
+            else:
+                rank -= left_size + 1
+                current = current.right
 
-        while (current != None):
-            # if right child is None
-            if (current.right == None):
-                # first increment count and
-                # check if count = k
-                count += 1
-                if (count == k):
-                    largest = current
-                # otherwise move to the left child
+    def rank(self, key: K) -> int:
+        """
+        Returns the position of key in the sorted order of the keys in the tree.
+        The smallest key has rank 1. In multimap mode the rank of the first of the equal keys.
+        :raises KeyError: if key is not in the tree
+        :complexity: O(CompK * log(N)) best and worst, where N is the number of nodes in the
+                        balanced tree and CompK is the complexity of comparing the keys
+        """
+        current = self.root
+        rank = 0
+        found = None
+        while current is not None:
+            if key < current.key:
                 current = current.left
+            elif key > current.key:
+                rank += self.get_size(current.left) + 1
+                current = current.right
             else:
-                # find inorder successor of
-                # current Node
-                succ = current.right
-                while (succ.left != None and
-                       succ.left != current):
-                    succ = succ.left
-
-                if (succ.left == None):
-                    # set left child of successor
-                    # to the current Node
-                    succ.left = current
-                    # move current to its right
-                    current = current.right
-
-                # restoring the tree back to
-                # original binary search tree
-                # removing threaded links
+                found = rank + self.get_size(current.left) + 1
+                if not self.multimap:
+                    return found
+                current = current.left  # an equal key further left comes first
+        if found is None:
+            raise KeyError('Key not found: {0}'.format(key))
+        return found
+
+    def kth_largest(self, k: int) -> AVLTreeNode:
+        """
+        Returns the kth largest element in the tree.
+        k=1 would return the largest. Returns None if k is out of range.
+        The tree is not modified.
+        :complexity: O(log(N)), see select(rank)
+        """
+        if k < 1 or k > len(self):
+            return None
+        return self.select(len(self) - k + 1)
+
+    def get_tree_node_by_key(self, key: K) -> AVLTreeNode:
+        """
+        Finds the node with the given key. In multimap mode, the first of the nodes
+        with the key in insertion order.
+        :raises KeyError: if the key is not in the tree
+        :complexity: O(CompK * log(N)) best and worst, where N is the number of nodes
+        """
+        if not self.multimap:
+            return self.get_tree_node_by_key_aux(self.root, key)
+        current = self.ceiling(key)
+        if current is None or current.key != key:
+            raise KeyError('Key not found: {0}'.format(key))
+        return current
+
+    def get_all(self, key: K) -> list[I]:
+        """
+        Returns the items of every node with the given key, in insertion order, an empty
+        list if there is none. Mostly of use in multimap mode.
+        :complexity: O(CompK * (log(N) + R)) where R is the number of items returned
+        """
+        return [item for _, item in self.range_iter(key, key)]
+
+    @classmethod
+    def from_sorted(cls, pairs: list[tuple[K, I]], multimap: bool = False) -> AVLTree[K, I]:
+        """
+        Builds a perfectly balanced tree from (key, item) pairs sorted by key.
+        The middle pair becomes the root and each half is built the same way, with the
+        heights and sizes set directly as the nodes are made, so no rotation is needed.
+        :pre: pairs is sorted by strictly increasing key, or non-decreasing key for a multimap
+        :raises ValueError: if the keys are not sorted, or not unique and multimap is not set
+        :complexity: O(N) best and worst, where N is the length of pairs
+        """
+        for i in range(1, len(pairs)):
+            if not (pairs[i - 1][0] < pairs[i][0] or multimap and pairs[i - 1][0] == pairs[i][0]):
+                raise ValueError('Keys must be sorted and unique')
+        tree = cls(multimap)
+        tree.root = tree.build_balanced(pairs, 0, len(pairs))
+        tree.length = len(pairs)
+        return tree
+
+    def build_balanced(self, pairs: list[tuple[K, I]], start: int, end: int) -> AVLTreeNode:
+        """
+        Builds a perfectly balanced sub-tree from pairs[start:end], see from_sorted.
+        Every node is made first, with the garbage collector paused: the nodes hold no
+        cycles, and otherwise its collections, triggered by so many new objects, take
+        longer than making them. The nodes are then linked by link_balanced.
+        :complexity: O(end - start)
+        :returns: the root of the sub-tree, None if the range is empty
+        """
+        if start >= end:
+            return None
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            nodes = [AVLTreeNode(key, item) for key, item in pairs[start:end]]
+        finally:
+            if collecting:
+                gc.enable()
+        return self.link_balanced(nodes, 0, len(nodes))
+
+    def link_balanced(self, nodes: list[AVLTreeNode], start: int, end: int) -> AVLTreeNode:
+        """
+        Links nodes[start:end], sorted by key, into a perfectly balanced sub-tree: the middle
+        node becomes the root and each half is linked the same way. A half of a single node
+        is a leaf already, so it is attached without a call.
+        :pre: end - start >= 1, and every node is a new leaf
+        :complexity: O(end - start)
+        :returns: the root of the sub-tree
+        """
+        middle = (start + end) // 2
+        current = nodes[middle]
+        if start + 1 < middle:
+            current.left = self.link_balanced(nodes, start, middle)
+        elif start < middle:
+            current.left = nodes[start]
+        if middle + 2 < end:
+            current.right = self.link_balanced(nodes, middle + 1, end)
+        elif middle + 1 < end:
+            current.right = nodes[middle + 1]
+        # a range split at its middle is as shallow as possible, so its height follows from its size
+        current.size = end - start
+        current.height = current.size.bit_length()
+        return current
+
+    def bulk_insert(self, pairs: list[tuple[K, I]]) -> None:
+        """
+        Inserts every (key, item) pair into the tree, in any order.
+        Keys that are not real numbers, or that are already in the tree or earlier in
+        pairs, are reported and skipped, exactly as __setitem__ would for each pair in turn.
+        In multimap mode every pair is kept, equal keys after those already in the tree.
+        The batch is sorted, built into a balanced tree with build_balanced, and merged
+        into the tree with union, so a large batch does not cost M separate insertions.
+        :complexity: O(M x log(M) + M x log(N/M + 1)) best and worst, where N is the number
+                     of elements of the tree and M the length of pairs
+        """
+        if KEY_TYPES.issuperset(map(type, map(itemgetter(0), pairs))):  # the usual case, every key is valid
+            batch = sorted(pairs, key=itemgetter(0))
+        else:
+            batch = [pair for pair in pairs if self.is_valid_key(pair[0])]
+            for _ in range(len(pairs) - len(batch)):
+                self.report(TypeError(KEY_TYPE_ERROR))
+            batch.sort(key=itemgetter(0))
+        # the sort is stable, so earlier pairs stay first among equal keys
+
+        if not self.multimap and len(set(map(itemgetter(0), batch))) < len(batch):
+            unique = batch[:1]
+            for pair in batch[1:]:
+                if pair[0] == unique[-1][0]:
+                    self.report(ValueError(DUPLICATE_ERROR))
                 else:
-                    succ.left = None
-                    count += 1
-                    if (count == k):
-                        largest = current
-                    # move current to its left child
-                    current = current.left
+                    unique.append(pair)
+            batch = unique
+
+        root = self.build_balanced(batch, 0, len(batch))
+        self.root = self.union_aux(self.root, root)
+        self.length = self.get_size(self.root)
+
+    def update(self, current: AVLTreeNode) -> None:
+        """
+        Recomputes the height and size of a node from its children.
+        :complexity: O(1)
+        """
+        current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
+        current.size = 1 + self.get_size(current.left) + self.get_size(current.right)
+
+    @classmethod
+    def join(cls, left: AVLTree[K, I], key: K, item: I, right: AVLTree[K, I]) -> AVLTree[K, I]:
+        """
+        Returns a tree holding the elements of left, a new element (key, item) and the
+        elements of right. The nodes of left and right are moved into the new tree,
+        leaving both of them empty.
+        :pre: every key of left is smaller than key, and every key of right is larger,
+              or equal for a multimap. The joined tree is a multimap if left is.
+        :raises ValueError: if the keys are not in that order
+        :complexity: O(log(N)) best and worst, where N is the number of elements of the joined tree
+        """
+        if left.root is not None:
+            largest = left.get_maximal(left.root).key
+            if not (largest < key or left.multimap and largest == key):
+                raise ValueError('Keys of left must be smaller, and keys of right larger, than key')
+        if right.root is not None:
+            smallest = right.get_minimal(right.root).key
+            if not (key < smallest or left.multimap and key == smallest):
+                raise ValueError('Keys of left must be smaller, and keys of right larger, than key')
+        tree = cls(left.multimap)
+        tree.root = tree.join_aux(left.root, AVLTreeNode(key, item), right.root)
+        tree.length = tree.get_size(tree.root)
+        left.root, left.length = None, 0
+        right.root, right.length = None, 0
+        return tree
+
+    def split(self, key: K) -> tuple[AVLTree[K, I], AVLTree[K, I]]:
+        """
+        Splits the tree in two: a tree holding the elements with keys smaller than key,
+        and a tree holding those with keys equal or larger. key need not be in the tree.
+        The nodes are moved into the two trees, leaving this tree empty.
+        :complexity: O(log(N)) best and worst, where N is the number of elements of the tree
+        """
+        smaller, found, larger = self.split_aux(self.root, key)
+        if found is not None:
+            larger = self.join_aux(None, found, larger)
+        trees = []
+        for root in (smaller, larger):
+            tree = type(self)(self.multimap)
+            tree.root = root
+            tree.length = self.get_size(root)
+            trees.append(tree)
+        self.root = None
+        self.length = 0
+        return trees[0], trees[1]
+
+    def union(self, other: AVLTree[K, I]) -> None:
+        """
+        Moves every element of other into this tree, leaving other empty. Keys that are
+        already in this tree are reported and skipped, as __setitem__ would, keeping the
+        items of this tree. In multimap mode they are kept, after the equal keys of this tree.
+        :complexity: O(M x log(N/M + 1)) best and worst, where M is the number of elements
+                     of the smaller tree and N of the larger
+        """
+        self.root = self.union_aux(self.root, other.root)
+        self.length = self.get_size(self.root)
+        other.root = None
+        other.length = 0
 
-        return largest
+    def join_aux(self, left: AVLTreeNode, middle: AVLTreeNode, right: AVLTreeNode) -> AVLTreeNode:
+        """
+        Joins two sub-trees and the node middle into one balanced sub-tree.
+        Descends the right spine of the taller of left and the left spine of the taller of
+        right until the heights are within one, hangs middle there with the two sub-trees as
+        its children, and rebalances on the way back up.
+        :pre: the keys of left are smaller than middle.key, and those of right larger
+        :complexity: O(|height(left) - height(right)| + 1)
+        :returns: the root of the joined sub-tree
+        """
+        left_height = self.get_height(left)
+        right_height = self.get_height(right)
+        if left_height > right_height + 1:
+            left.right = self.join_aux(left.right, middle, right)
+            current = left
+        elif right_height > left_height + 1:
+            right.left = self.join_aux(left, middle, right.left)
+            current = right
+        else:
+            middle.left = left
+            middle.right = right
+            self.update(middle)
+            return middle
+
+        self.update(current)
+        if -2 < self.get_balance(current) < 2:
+            return current
+        return self.rebalance(current)
 
+    def split_aux(self, current: AVLTreeNode, key: K) -> tuple[AVLTreeNode, AVLTreeNode, AVLTreeNode]:
+        """
+        Splits the sub-tree rooted at current around key, using join_aux to put back
+        together the sub-trees left on each side of the path to key.
+        In multimap mode no node is singled out: nodes with key go to the larger side.
+        :complexity: O(log(N)) where N is the number of elements of the sub-tree
+        :returns: the root of the sub-tree of keys smaller than key, the node with key
+                  (detached, None if there is none), and the root of the sub-tree of larger keys
+        """
+        if current is None:
+            return None, None, None
+        if key < current.key or self.multimap and key == current.key:
+            smaller, found, larger = self.split_aux(current.left, key)
+            return smaller, found, self.join_aux(larger, current, current.right)
+        if key > current.key:
+            smaller, found, larger = self.split_aux(current.right, key)
+            return self.join_aux(current.left, current, smaller), found, larger
+        smaller, larger = current.left, current.right
+        current.left = current.right = None
+        self.update(current)
+        return smaller, current, larger
+
+    def union_aux(self, first: AVLTreeNode, second: AVLTreeNode) -> AVLTreeNode:
+        """
+        Merges two sub-trees: second is split around the key of the root of first, each
+        half merged with the matching child of first, and the results joined back with
+        the root of first. A node of second with a key already in first is reported and dropped.
+        :complexity: O(M x log(N/M + 1)), see union
+        :returns: the root of the merged sub-tree
+        """
+        if first is None:
+            return second
+        if second is None:
+            return first
+        smaller, found, larger = self.split_aux(second, first.key)
+        if found is not None:
+            self.report(ValueError(DUPLICATE_ERROR))
+        left = self.union_aux(first.left, smaller)
+        right = self.union_aux(first.right, larger)
+        return self.join_aux(left, first, right)
 
 if __name__ == '__main__':
     b = AVLTree()
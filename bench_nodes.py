@@ -0,0 +1,75 @@
+""" Memory benchmark for the tree nodes.
+
+Builds an AVL tree of N keys with the slotted AVLTreeNode, and again with a
+subclass of it that has a per-instance __dict__ (as the nodes had before they
+declared __slots__), and reports the bytes allocated per node for each. The
+array-backed ArrayAVLTree is measured alongside them.
+
+Usage: python bench_nodes.py [N], N defaults to 1000000.
+"""
+
+__docformat__ = 'reStructuredText'
+
+import random
+import sys
+import tracemalloc
+
+import avl
+from array_avl import ArrayAVLTree
+from node import AVLTreeNode
+
+
+class DictAVLTreeNode(AVLTreeNode):
+    """ AVL tree node with a per-instance __dict__, for comparison. """
+
+
+def bytes_per_node(node_class: type, n: int) -> float:
+    """
+    Inserts n shuffled keys into an AVL tree built from node_class and returns
+    the memory allocated for the tree divided by n.
+    :complexity: O(n log(n))
+    """
+    keys = list(range(n))
+    random.Random(0).shuffle(keys)
+
+    saved = avl.AVLTreeNode
+    avl.AVLTreeNode = node_class  # the node class AVLTree.insert_aux creates
+    try:
+        tracemalloc.start()
+        tree = avl.AVLTree()
+        for key in keys:
+            tree[key] = None
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        avl.AVLTreeNode = saved
+    return allocated / n
+
+
+def array_bytes_per_node(n: int) -> float:
+    """
+    Inserts n shuffled keys into an ArrayAVLTree and returns the memory allocated
+    for the tree divided by n.
+    :complexity: O(n log(n))
+    """
+    keys = list(range(n))
+    random.Random(0).shuffle(keys)
+
+    tracemalloc.start()
+    tree = ArrayAVLTree()
+    for key in keys:
+        tree[key] = None
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return allocated / n
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with_dict = bytes_per_node(DictAVLTreeNode, n)
+    slotted = bytes_per_node(AVLTreeNode, n)
+    arrays = array_bytes_per_node(n)
+    print(f"AVL tree of {n} keys")
+    print(f"  with __dict__:  {with_dict:.1f} bytes per node")
+    print(f"  with __slots__: {slotted:.1f} bytes per node")
+    print(f"  ArrayAVLTree:   {arrays:.1f} bytes per node")
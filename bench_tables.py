@@ -0,0 +1,77 @@
+""" Benchmark of the potion tables.
+
+Fills each potion table, and LinearProbePotionTable with each of its
+probing strategies, to the same prime size with N potion names sharing the
+prefix "Potion of ", at load factors from 0.5 to 0.95. Reports for each the
+time to insert every name, to look every name up and to look up N names
+that are not there, along with the conflict count, probe total and probe max
+of the insertions. Quadratic probing is only run up to a load factor of 0.5.
+
+Usage: python bench_tables.py [N], N defaults to 20000.
+"""
+
+__docformat__ = 'reStructuredText'
+
+import math
+import sys
+import time
+
+from chaining_table import ChainingPotionTable
+from hash_table import LinearProbePotionTable, LINEAR, QUADRATIC, DOUBLE
+from primes import next_prime
+from robin_hood_table import RobinHoodPotionTable
+
+LOAD_FACTORS = (0.5, 0.6, 0.7, 0.8, 0.9, 0.95)
+
+# label and constructor, from the number of names, the table size and the load factor
+TABLES = (
+    ("linear", lambda n, size, load: LinearProbePotionTable(n, True, size, 1, LINEAR)),
+    ("quadratic", lambda n, size, load: LinearProbePotionTable(n, True, size, 0.5, QUADRATIC)
+        if load <= 0.5 else None),
+    ("double", lambda n, size, load: LinearProbePotionTable(n, True, size, 1, DOUBLE)),
+    ("chaining", lambda n, size, load: ChainingPotionTable(n, True, size, 1)),
+    ("robin hood", lambda n, size, load: RobinHoodPotionTable(n, True, size, 1)),
+)
+
+
+def run(table, names: list[str], missing: list[str]) -> tuple:
+    """
+    Inserts names into table, which is large enough not to grow, then looks up
+    names and missing.
+    :complexity: O(N) expected, where N is the length of names
+    :returns: the insertion, hit and miss times in seconds, and the statistics of the insertions
+    """
+    start = time.perf_counter()
+    for name in names:
+        table[name] = name
+    insert_time = time.perf_counter() - start
+    statistics = table.statistics()
+
+    start = time.perf_counter()
+    for name in names:
+        table[name]
+    hit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name in missing:
+        name in table
+    miss_time = time.perf_counter() - start
+    return insert_time, hit_time, miss_time, statistics
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    names = ["Potion of " + str(x) for x in range(n)]
+    missing = ["Potion of " + str(x) for x in range(n, 2 * n)]
+
+    print(f"{n} names, times in seconds")
+    print(f"{'load':>5} {'table':>12} {'insert':>8} {'hit':>8} {'miss':>8} {'conflicts':>10} {'probes':>9} {'max':>6}")
+    for load_factor in LOAD_FACTORS:
+        tablesize = next_prime(math.ceil(n / load_factor))
+        for label, make in TABLES:
+            table = make(n, tablesize, n / tablesize)
+            if table is None:
+                continue
+            insert_time, hit_time, miss_time, (conflicts, probes, probe_max) = run(table, names, missing)
+            print(f"{n / tablesize:5.2f} {label:>12} {insert_time:8.3f} {hit_time:8.3f} {miss_time:8.3f} "
+                  f"{conflicts:10} {probes:9} {probe_max:6}")
@@ -8,8 +8,7 @@ from __future__ import annotations
 __author__ = 'Brendon Taylor, modified by Alexey Ignatiev and Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
-from typing import TypeVar, Generic
-from linked_stack import LinkedStack
+from typing import TypeVar, Generic, Iterator
 from node import TreeNode
 import sys
 
@@ -22,13 +21,14 @@ T = TypeVar('T')
 
 class BSTInOrderIterator:
     """ In-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+        Performs stack-based BST traversal, with the stack kept in a Python list so that
+        a push does not allocate a node.
     """
 
     def __init__(self, root: TreeNode[K, I]) -> None:
         """ Iterator initialiser. """
 
-        self.stack = LinkedStack()
+        self.stack = []
         self.current = root
 
     def __iter__(self) -> BSTInOrderIterator:
@@ -42,10 +42,10 @@ class BSTInOrderIterator:
         """
 
         while self.current:
-            self.stack.push(self.current)
+            self.stack.append(self.current)
             self.current = self.current.left
 
-        if self.stack.is_empty():
+        if len(self.stack) == 0:
             raise StopIteration
 
         result = self.stack.pop()
@@ -54,6 +54,91 @@ class BSTInOrderIterator:
         return result.key
 
 
+class BSTRangeIterator:
+    """ In-order iterator over the part of the binary search tree with keys in [lo, hi].
+        Descends from the root straight to the first key not smaller than lo, keeping on
+        the stack only the nodes whose keys are still to come, and stops at the first key
+        larger than hi. Returns (key, item) pairs.
+    """
+
+    def __init__(self, root: TreeNode[K, I], lo: K, hi: K) -> None:
+        """ Iterator initialiser. """
+
+        self.stack = []
+        self.lo = lo
+        self.hi = hi
+        self.push_left(root)
+
+    def __iter__(self) -> BSTRangeIterator:
+        """ Standard __iter__() method for initialisers. Returns itself. """
+
+        return self
+
+    def push_left(self, current: TreeNode[K, I]) -> None:
+        """ Pushes the nodes on the left spine of current with keys not smaller than lo,
+            skipping to the right child of any node with a smaller key.
+        """
+
+        while current is not None:
+            if current.key < self.lo:
+                current = current.right
+            else:
+                self.stack.append(current)
+                current = current.left
+
+    def __next__(self) -> tuple[K, I]:
+        """ The main body of the iterator.
+            Returns the (key, item) pairs in range one by one respecting the in-order.
+        """
+
+        if len(self.stack) == 0:
+            raise StopIteration
+
+        result = self.stack.pop()
+        if result.key > self.hi:
+            self.stack.clear()
+            raise StopIteration
+        self.push_left(result.right)
+
+        return result.key, result.item
+
+
+class BSTReverseIterator:
+    """ Reverse in-order iterator for the binary search tree, from the largest key to the
+        smallest. Performs stack-based BST traversal, mirroring BSTInOrderIterator, with the
+        stack kept in a Python list.
+        Returns (key, item) pairs.
+    """
+
+    def __init__(self, root: TreeNode[K, I]) -> None:
+        """ Iterator initialiser. """
+
+        self.stack = []
+        self.current = root
+
+    def __iter__(self) -> BSTReverseIterator:
+        """ Standard __iter__() method for initialisers. Returns itself. """
+
+        return self
+
+    def __next__(self) -> tuple[K, I]:
+        """ The main body of the iterator.
+            Returns the (key, item) pairs of the BST one by one respecting the reverse in-order.
+        """
+
+        while self.current:
+            self.stack.append(self.current)
+            self.current = self.current.right
+
+        if len(self.stack) == 0:
+            raise StopIteration
+
+        result = self.stack.pop()
+        self.current = result.left
+
+        return result.key, result.item
+
+
 class BinarySearchTree(Generic[K, I]):
     """ Basic binary search tree. """
 
@@ -95,6 +180,78 @@ class BinarySearchTree(Generic[K, I]):
         """ Create an in-order iterator. """
         return BSTInOrderIterator(self.root)
 
+    def items(self) -> Iterator[tuple[K, I]]:
+        """
+            Generates the (key, item) pairs of the tree in order, so that no item has to be
+            looked up again by its key. Walks the tree with a Python list as the stack.
+            :complexity: O(N) to exhaust it, where N is the number of nodes. Each step is lazy.
+        """
+        stack = []
+        current = self.root
+        while True:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            if len(stack) == 0:
+                return
+            current = stack.pop()
+            yield current.key, current.item
+            current = current.right
+
+    def values(self) -> Iterator[I]:
+        """
+            Generates the items of the tree in the order of their keys, see items().
+            :complexity: O(N) to exhaust it, where N is the number of nodes
+        """
+        for _, item in self.items():
+            yield item
+
+    def range_iter(self, lo: K, hi: K) -> BSTRangeIterator:
+        """
+            Create an iterator over the (key, item) pairs with lo <= key <= hi, in order.
+            :complexity: O(CompK * (D + R)) to exhaust it, where D is the depth of the tree and R
+                         the number of keys in range. Each step is lazy.
+        """
+        return BSTRangeIterator(self.root, lo, hi)
+
+    def reverse_iter(self) -> BSTReverseIterator:
+        """ Create an iterator over the (key, item) pairs from the largest key to the smallest. """
+        return BSTReverseIterator(self.root)
+
+    def floor(self, key: K) -> TreeNode:
+        """
+            Returns the node with the largest key not larger than key, None if there is none.
+            Of several nodes with that key, the last in order is returned.
+            The tree is not modified.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        result = None
+        current = self.root
+        while current is not None:
+            if key < current.key:
+                current = current.left
+            else:
+                result = current
+                current = current.right
+        return result
+
+    def ceiling(self, key: K) -> TreeNode:
+        """
+            Returns the node with the smallest key not smaller than key, None if there is none.
+            Of several nodes with that key, the first in order is returned.
+            The tree is not modified.
+            :complexity: O(CompK * D) where D is the depth of the tree
+        """
+        result = None
+        current = self.root
+        while current is not None:
+            if key > current.key:
+                current = current.right
+            else:
+                result = current
+                current = current.left
+        return result
+
     def __getitem__(self, key: K) -> I:
         """
             Attempts to get an item in the tree, it uses the Key to attempt to find it
@@ -108,45 +265,59 @@ class BinarySearchTree(Generic[K, I]):
         return self.get_tree_node_by_key_aux(self.root, key)
 
     def get_tree_node_by_key_aux(self, current: TreeNode, key: K) -> TreeNode:
-        if current is None:  # base case: empty
-            raise KeyError('Key not found: {0}'.format(key))
-        elif key == current.key:  # base case: found
-            return current
-        elif key < current.key:
-            return self.get_tree_node_by_key_aux(current.left, key)
-        else:  # key > current.key
-            return self.get_tree_node_by_key_aux(current.right, key)
+        """
+            Finds the node with the given key in the sub-tree rooted at current,
+            descending iteratively from current.
+            :raises KeyError: if the key is not in the sub-tree
+            :complexity best: O(CompK) finds the key at current
+            :complexity worst: O(CompK * D) key is not found, where D is the depth of the tree
+        """
+        while current is not None:
+            if key == current.key:  # found
+                return current
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))
 
     def getitem_aux(self, current: TreeNode, key: K) -> I:
-        if current is None:  # base case: empty
-            raise KeyError('Key not found: {0}'.format(key))
-        elif key == current.key:  # base case: found
-            return current.item
-        elif key < current.key:
-            return self.getitem_aux(current.left, key)
-        else:  # key > current.key
-            return self.getitem_aux(current.right, key)
+        return self.get_tree_node_by_key_aux(current, key).item
 
     def __setitem__(self, key: K, item: I) -> None:
         self.root = self.insert_aux(self.root, key, item)
 
     def insert_aux(self, current: TreeNode, key: K, item: I) -> TreeNode:
         """
-            Attempts to insert an item into the tree, it uses the Key to insert it
+            Attempts to insert an item into the tree, it uses the Key to insert it.
+            Descends iteratively from current to the leaf position of the key, so
+            the depth of the tree is not limited by the recursion limit.
+            Returns the root of the sub-tree after insertion.
+            :raises ValueError: if key is a duplicate value
             :complexity best: O(CompK) inserts the item at the root.
             :complexity worst: O(CompK * D) inserting at the bottom of the tree
             where D is the depth of the tree
             CompK is the complexity of comparing the keys
         """
-        if current is None:  # base case: at the leaf
-            current = TreeNode(key, item)
+        if current is None:  # empty sub-tree, the new node is its root
             self.length += 1
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-        else:  # key == current.key
-            raise ValueError('Inserting duplicate item')
+            return TreeNode(key, item)
+
+        parent = current
+        while True:
+            if key < parent.key:
+                if parent.left is None:
+                    parent.left = TreeNode(key, item)
+                    break
+                parent = parent.left
+            elif key > parent.key:
+                if parent.right is None:
+                    parent.right = TreeNode(key, item)
+                    break
+                parent = parent.right
+            else:  # key == parent.key
+                raise ValueError('Inserting duplicate item')
+        self.length += 1
         return current
 
     def __delitem__(self, key: K) -> None:
@@ -156,32 +327,77 @@ class BinarySearchTree(Generic[K, I]):
         """
             Attempts to delete an item from the tree, it uses the Key to
             determine the node to delete.
+            Returns the root of the sub-tree after deletion.
         """
+        path, child = self.delete_path(current, key)
+        if len(path) == 0:  # current itself was removed
+            return child
+        return current
 
+    def delete_path(self, current: TreeNode, key: K, first: bool = False) -> tuple[list, TreeNode]:
+        """
+            Iteratively removes the node with the given key from the sub-tree rooted at current.
+            A node with two children takes the key and item of its successor, and the
+            successor's node is removed instead. The node removed is replaced by its only
+            child, or None.
+            If first is set, the sub-tree may hold the key more than once, and the first node
+            with the key in order is removed, rather than the first one met on the way down.
+            :raises ValueError: if the key is not in the sub-tree
+            :complexity best: O(CompK) removes current, which has at most one child
+            :complexity worst: O(CompK * D) where D is the depth of the tree
+            :returns: the path of nodes from current down to the parent of the node removed,
+                      and the child that took the place of the node removed
+        """
+        path = []
+        if first:
+            # keep descending left past every node with the key, remembering the last one met
+            found = None
+            depth = 0
+            while current is not None:
+                if key == current.key:
+                    found, depth = current, len(path)
+                path.append(current)
+                current = current.left if key <= current.key else current.right
+            del path[depth:]
+            current = found
+        else:
+            while current is not None and key != current.key:
+                path.append(current)
+                current = current.left if key < current.key else current.right
         if current is None:  # key not found
             raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
-            current.key  = succ.key
+        return path, self.unlink(path, current)
+
+    def unlink(self, path: list, current: TreeNode) -> TreeNode:
+        """
+            Removes the node current, reached from the root of its sub-tree by path.
+            A node with two children takes the key and item of its successor, and the
+            successor's node is removed instead, its path added to path.
+            :pre: path[i + 1] is a child of path[i], and current is a child of path[-1] if path is not empty
+            :post: path runs down to the parent of the node removed
+            :complexity: O(D) where D is the depth of the successor below current
+            :returns: the child that took the place of the node removed
+        """
+        if current.left is not None and current.right is not None:
+            # general case => take over the successor, then remove its node
+            path.append(current)
+            succ = current.right
+            while succ.left is not None:
+                path.append(succ)
+                succ = succ.left
+            current.key = succ.key
             current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
+            current = succ
 
-        return current
+        child = current.left if current.left is not None else current.right
+        if len(path) > 0:
+            parent = path[-1]
+            if parent.left is current:
+                parent.left = child
+            else:
+                parent.right = child
+        self.length -= 1
+        return child
 
     def get_successor(self, current: TreeNode) -> TreeNode:
         """
@@ -223,6 +439,21 @@ class BinarySearchTree(Generic[K, I]):
             else:
                 current = current.left
 
+    def get_maximal(self, current: TreeNode) -> TreeNode:
+        """
+        Get a node having the largest key in the current sub-tree.
+        Traverse from root of sub-tree to right until right is None.
+        :pre: Current roots a sorted binary tree or sub-tree
+        :post: Tree is not changed
+        :raises ValueError: if current is None, raises Subtree is empty
+        :complexity: Best O(1), worst O(log N) where N is the height of current.
+        """
+        if current is None:
+            raise ValueError('Subtree is empty')
+        while current.right is not None:
+            current = current.right
+        return current
+
 
     def is_leaf(self, current: TreeNode) -> bool:
         """ Simple check whether or not the node is a leaf. """
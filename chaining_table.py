@@ -0,0 +1,251 @@
+""" Hash Table ADT
+
+Defines a Hash Table using separate chaining for conflict resolution.
+Every slot of the table holds a bucket of the entries whose keys hash to
+it, kept flat in a single Python list of hash, key and data triples, so
+that an entry costs three references rather than a tuple or a node.
+"""
+__docformat__ = 'reStructuredText'
+
+from hash_table import HASH_MODULUS, mix_hash
+from potion import Potion
+from primes import next_prime
+from referential_array import ArrayR
+from typing import TypeVar, Generic
+
+T = TypeVar('T')
+
+# Number of references taken by an entry of a bucket: its full hash, key and data
+ENTRY_WIDTH = 3
+
+
+class ChainingPotionTable(Generic[T]):
+    """
+    Separate Chaining Potion Table, with the same interface as LinearProbePotionTable.
+
+    The bucket of a slot is None until a key hashes to it, then a list
+    [hash0, key0, data0, hash1, key1, data1, ...]. Searching a bucket compares
+    the stored full hashes before the keys. Deletion removes the entry from its
+    bucket. Once an insertion would take the number of entries past
+    max_load_factor times table_size, every entry is moved at once into a table
+    of the next prime size above twice the current size, by its stored hash.
+    max_load_factor may be larger than 1, as a bucket holds any number of entries.
+
+    The statistics are counted as for LinearProbePotionTable, with the entries
+    of a bucket stepped past in place of the slots: every probe adds the entries
+    it stepped past to probe_total, and the insertions and failed lookups that
+    stepped past any entry count as conflicts (conflict_count), the most entries
+    stepped past by one of them being probe_max.
+
+    attributes:
+        count: number of elements in the hash table
+        table: the array of buckets
+        table_size: current size of the hash table
+        max_load_factor: entries per bucket on average that can be reached before growing
+    """
+
+    def __init__(self, max_potions: int, good_hash: bool = True, tablesize_override: int = -1,
+                 max_load_factor: float = 0.5) -> None:
+        if not 0 < max_load_factor:
+            raise ValueError("Load factor must be positive")
+
+        # Statistic setting
+        self.conflict_count = 0
+        self.probe_max = 0
+        self.probe_total = 0
+
+        self.count = 0
+        self.table = None
+        self.table_size = 0
+        self.max_load_factor = max_load_factor
+        self.useHash = good_hash
+
+        if tablesize_override != -1:
+            self.initalise_with_tablesize(tablesize_override)
+        else:
+            self.initalise_with_tablesize(max_potions * 2)
+
+    def hash(self, potion_name: str) -> int:
+        """
+        Hashes the potions name into its full hash, see LinearProbePotionTable.hash
+        :complexity: O(K) where K is the length of the name for good hash, O(1) for bad hash
+        """
+        if self.useHash:
+            return mix_hash(Potion.good_hash(potion_name, HASH_MODULUS))
+        else:
+            return Potion.bad_hash(potion_name, HASH_MODULUS)
+
+    def statistics(self) -> tuple:
+        """
+        Creates a tuple with the conflict_count, probe_total and probe_max
+        :complexity: O(1)
+        """
+        return (self.conflict_count, self.probe_total, self.probe_max,)
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the hash table
+        :complexity: O(1)
+        """
+        return self.count
+
+    def __record_probe(self, steps: int, reached_end: bool) -> None:
+        """
+        Adds a probe that stepped past the given number of entries to the statistics, see
+        LinearProbePotionTable. A probe that went on to the end of its bucket, an insertion
+        or a failed lookup, counts as a conflict if it stepped past any entry, and for probe_max.
+        :complexity: O(1)
+        """
+        self.probe_total += steps
+        if reached_end:
+            if steps > 0:
+                self.conflict_count += 1
+            if self.probe_max < steps:
+                self.probe_max = steps
+
+    def __search(self, bucket: list, key: str, key_hash: int, record: bool = True) -> int:
+        """
+        Find the index of the entry for key in a bucket, -1 if it is not there.
+        :param record: count the probe in the statistics
+        :complexity: O(K + B) where K is the size of the key and B the length of the bucket
+        """
+        if bucket is None:
+            if record:
+                self.__record_probe(0, True)
+            return -1
+        for index in range(0, len(bucket), ENTRY_WIDTH):
+            if bucket[index] == key_hash and bucket[index + 1] == key:
+                if record:
+                    self.__record_probe(index // ENTRY_WIDTH, False)
+                return index
+        if record:
+            self.__record_probe(len(bucket) // ENTRY_WIDTH, True)
+        return -1
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        :see: #self.__getitem__(self, key: str)
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: str) -> T:
+        """
+        Get the item at a certain key
+        :see: #self.__search(bucket: list, key: str, key_hash: int)
+        :raises KeyError: when the item doesn't exist
+        """
+        key_hash = self.hash(key)
+        bucket = self.table[key_hash % self.table_size]
+        index = self.__search(bucket, key, key_hash)
+        if index == -1:
+            raise KeyError(key)
+        return bucket[index + 2]
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+        Set an (key, data) pair in our hash table, updating the entry of key if there is
+        one, and otherwise appending a new entry to the bucket of key, growing the table
+        first if the new entry would take it past max_load_factor.
+        :complexity: O(K + B) where K is the size of the key and B the length of its bucket,
+                     amortised over growing the table
+        """
+        key_hash = self.hash(key)
+        bucket = self.table[key_hash % self.table_size]
+        index = self.__search(bucket, key, key_hash, False)
+        if index != -1:
+            self.__record_probe(index // ENTRY_WIDTH, False)
+            bucket[index + 2] = data
+            return
+
+        if self.count + 1 > self.max_load_factor * self.table_size:
+            self.__rehash(next_prime(2 * self.table_size))
+        position = key_hash % self.table_size
+        if self.table[position] is None:
+            self.table[position] = []
+        bucket = self.table[position]
+
+        self.__record_probe(len(bucket) // ENTRY_WIDTH, True)
+        bucket.extend((key_hash, key, data))
+        self.count += 1
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Delete the (key, data) pair with the given key from its bucket.
+        :complexity: O(K + B) where K is the size of the key and B the length of its bucket
+        :raises KeyError: when the key doesn't exist
+        """
+        key_hash = self.hash(key)
+        position = key_hash % self.table_size
+        bucket = self.table[position]
+        index = self.__search(bucket, key, key_hash)
+        if index == -1:
+            raise KeyError(key)
+        del bucket[index:index + ENTRY_WIDTH]
+        if len(bucket) == 0:
+            self.table[position] = None
+        self.count -= 1
+
+    def __rehash(self, tablesize: int) -> None:
+        """
+        Move every entry into a new table of the given size, placed by its stored hash.
+        Moving entries is not counted in the statistics.
+        :complexity: O(N + M) where N is the current and M the new table_size
+        """
+        old_table = self.table
+        self.table_size = tablesize
+        self.table = ArrayR(tablesize)
+        for bucket in old_table:
+            if bucket is not None:
+                for index in range(0, len(bucket), ENTRY_WIDTH):
+                    position = bucket[index] % tablesize
+                    if self.table[position] is None:
+                        self.table[position] = []
+                    self.table[position].extend(bucket[index:index + ENTRY_WIDTH])
+
+    def initalise_with_tablesize(self, tablesize: int) -> None:
+        """
+        Initialise a new array, with table size given by tablesize.
+        Complexity: O(n), where n is len(tablesize)
+        """
+        self.count = 0
+        self.table_size = tablesize
+        self.table = ArrayR(tablesize)
+
+    def is_empty(self):
+        """
+        Returns whether the hash table is empty
+        :complexity: O(1)
+        """
+        return self.count == 0
+
+    def is_full(self):
+        """
+        Returns whether the hash table is full, which a chaining table never is
+        :complexity: O(1)
+        """
+        return False
+
+    def insert(self, key: str, data: T) -> None:
+        """
+        Utility method to call our setitem method
+        :see: #__setitem__(self, key: str, data: T)
+        """
+        self[key] = data
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular order)
+        :complexity: O(N) where N is the table size plus the number of entries
+        """
+        result = ""
+        for bucket in self.table:
+            if bucket is not None:
+                for index in range(0, len(bucket), ENTRY_WIDTH):
+                    result += "(" + str(bucket[index + 1]) + "," + str(bucket[index + 2]) + ")\n"
+        return result
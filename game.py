@@ -1,6 +1,7 @@
-from linked_stack import LinkedStack
+from bisect import bisect_right
+from typing import Callable, Optional
 from random_gen import RandomGen
-from hash_table import LinearProbePotionTable
+from hash_table import LinearProbePotionTable, NO_STATS
 from potion import Potion
 from avl import AVLTree
 
@@ -23,24 +24,27 @@ class Game:
             O(log(N)) in the worst and O(1) in the best case, when the tree is empty.
             To match our required time complexity for the all the used operations (when
             finding the correct potion), we decided to go with the AVL tree.
+            It is a multimap, keyed by buy price, so potions sharing a price are all kept.
+            Each potion has a single entry: restocking a potion replaces its entry.
+
+        stocked: dict
+            The buy price each potion in the inventory is keyed by, to tell a restock from a
+            new potion and to find the entry a restock replaces.
 
         ratio tree: AVL Tree
             Used to store the potions in potion_valuation by its profit ratio as
             the key. This allows the tree to be sorted by the best ratio to the worst ratio so
             that when traversing through, it is at its best time complexity to find the best ratio
-            to begin the trading and selling process.
-
-            tree stack: Linked Stack
-            This stores any duplicates of the same ratio within itself before being
-            inserted into the tree. Having this stack allows for any duplication errors to be overcome
-            and its implementation to allow for poping and pushing of duplicates when necessary without
-            affecting the time complexity of having to iterate through a list or array.
+            to begin the trading and selling process. It is a multimap, so potions with the
+            same ratio are all kept, in the order they were inserted, without having to work
+            around duplicate key errors.
     """
 
     def __init__(self, seed=0) -> None:
         self.rand = RandomGen(seed=seed)
         self.potion_table = None
-        self.inventory = AVLTree()
+        self.inventory = AVLTree(multimap=True)
+        self.stocked = {}
 
     def set_total_potion_data(self, potion_data: list) -> None:
         """
@@ -50,85 +54,153 @@ class Game:
         :param potion_data: list of potion data ["Potion of Health Regeneration", "Health", 20]
         :pre: List has to be correct, is not empty
         :complexity: O(N) -> N is the length of potion data
-                     adding items to a hash table is O(1)
+                     adding items to a hash table is O(1), and they are added together
+                     with LinearProbePotionTable.bulk_insert, probing once for each
         :return: None
         """
-        self.potion_table = LinearProbePotionTable(len(potion_data))
+        self.potion_table = LinearProbePotionTable(len(potion_data), stats=NO_STATS)  # nobody reads its statistics
+        pairs = []
         for potion in potion_data:
             name, _type, price = potion
-            self.potion_table[name] = Potion.create_empty(_type, name, price)
+            pairs.append((name, Potion.create_empty(_type, name, price)))
+        self.potion_table.bulk_insert(pairs)
 
     def add_potions_to_inventory(self, potion_name_amount_pairs: list[tuple[str, float]]) -> None:
         """
         Add litres of potion into the current inventory of the vendor company. Takes a list
         of tuples containing names of potion and a float representing litres to add to the inventory.
-        :complexity: Best and worst O(N), where N is the length of potion_name_amount_pairs
+        A potion already in the inventory, or named more than once, keeps only its last amount.
+        Every name is looked up before the inventory is changed, so a batch naming an unknown
+        potion changes nothing. The old entry of each potion restocked is then deleted from the
+        live inventory, see __remove_from_inventory, and the whole batch is built into a
+        balanced tree and merged into it with AVLTree.union, see AVLTree.bulk_insert.
+        :complexity: Best and worst O(N x log(N) + N x log(I/N + 1) + R x (log(I) + E)), where N
+                     is the length of potion_name_amount_pairs, I the number of potions already in
+                     the inventory, R the number of them restocked and E the most potions sharing a
+                     buy price with one of them
+        :raises KeyError: if a name is not in the potion table, leaving the inventory as it was
         """
-        for potion in potion_name_amount_pairs:
-            name, amount = potion
-            potion_object = self.potion_table[name]
+        potion_amounts = {}  # name -> amount, in the order the names first appear
+        for name, amount in potion_name_amount_pairs:
+            potion_amounts[name] = amount
+        names = list(potion_amounts)
+        potion_objects = self.potion_table.get_many(names)
+
+        for name in names:
+            if name in self.stocked:
+                self.__remove_from_inventory(name, self.stocked[name])
+        pairs = []
+        for i in range(len(names)):
+            amount = potion_amounts[names[i]]
+            potion_object = potion_objects[i]
             potion_object.quantity = amount
-            self.inventory[potion_object.buy_price] = (potion_object, amount)
+            pairs.append((potion_object.buy_price, (potion_object, amount)))
+            self.stocked[names[i]] = potion_object.buy_price
+        self.inventory.bulk_insert(pairs)
 
-    def choose_potions_for_vendors(self, num_vendors: int) -> list[tuple[str, float]]:
+    def __remove_from_inventory(self, name: str, price: float) -> None:
+        """
+        Deletes the entry of the potion name, keyed by price, from the inventory. Its rank is
+        that of the first entry with the price plus its place among the entries sharing the price.
+        :pre: the potion is in the inventory, keyed by price
+        :complexity: O(log(I) + E) where I is the number of potions in the inventory and E the
+                     number of them sharing the price
+        """
+        rank = self.inventory.rank(price)
+        for offset, (_, entry) in enumerate(self.inventory.range_iter(price, price)):
+            if entry[0].name == name:
+                self.inventory.delete_rank(rank + offset)
+                return
+
+    def choose_potions_for_vendors(self, num_vendors: int, compatible: bool = True) -> list[tuple[str, float]]:
         """
         This method completes the vendor potion selection process and returns a list
         of potion names along with their quantity in inventory
+
+        In compatible mode each vendor keeps drawing p = randint(N) until p has not been
+        taken yet, and sells the pth largest potion, giving the same vendors for a given
+        seed as always. The taken values are kept in a set, so each retry is O(1), but the
+        number of retries grows like the coupon collector problem as C approaches N.
+        Otherwise the ranks are drawn by a partial Fisher-Yates shuffle of 1..N: vendor i
+        draws one of the N - i ranks not taken yet, so every vendor costs exactly one draw.
+        The shuffle only stores the positions it has swapped, in a dictionary.
+
         :param num_vendors: int
-        :pre: num_vendors > 0
+        :param compatible: draw with rejection as the seeded game always has, rather than
+            with the rejection-free shuffle
+        :pre: 0 < num_vendors <= len(self.inventory)
+        :raises ValueError: if there are more vendors than potions in the inventory
         :required complexity: O(C x log(N))
-        :achieved complexity: O(C x log(N))
+        :achieved complexity: O(C x log(N)) with the shuffle - each vendor's potion is found
+            with an order statistic query on the inventory instead of walking the whole tree.
+            The expected number of draws with rejection is O(N x log(N)) when C is close to N.
         :return: list of tuples [(name_of_potion, quantity)]
         """
-        # self.inventory.print_tree()
+        if num_vendors > len(self.inventory):
+            raise ValueError(f"Cannot choose {num_vendors} vendors from {len(self.inventory)} potions")
+
         vendor_potion_list = []
-        checked = [0]
-        # saved_inventory = self.inventory
+        checked = {0}
+        swapped = {}  # position -> rank, for the positions of the shuffle that are not in order
         # O(C) -> C is the number of vendors
         for i in range(num_vendors):
-            p = 0
-            while p in checked:
-                p = self.rand.randint(len(self.inventory))
-            checked.append(p)
-            pth_index = (len(self.inventory) - p)
+            if compatible:
+                p = 0
+                while p in checked:
+                    p = self.rand.randint(len(self.inventory))
+                checked.add(p)
+            else:
+                # swap position i with a random position from i to N - 1, ranks are position + 1
+                j = i + self.rand.randint(len(self.inventory) - i) - 1
+                p = swapped.get(j, j + 1)
+                swapped[j] = swapped.get(i, i + 1)
+            # the pth largest potion in the inventory
             # O(log(N)) -> N is the number of items in inventory
-            for j, key in list(enumerate(self.inventory)):
-                # p starts from 1 - k, hence we add 1 to j
-                if pth_index == j:
-                    # getting items from an AVL tree is usually O(1)
-                    node = self.inventory.get_tree_node_by_key(key).item
-                    name, amount = node[0].name, node[1]
-                    self.potion_table[name].quantity = amount
-                    vendor_potion_list.append((name, amount))
-                    # del self.inventory[key]
-                    break
-
-        # self.inventory = saved_inventory
+            node = self.inventory.kth_largest(p).item
+            name, amount = node[0].name, node[1]
+            self.potion_table[name].quantity = amount
+            vendor_potion_list.append((name, amount))
+
         return vendor_potion_list
 
-    def solve_game(self, potion_valuations: list[tuple[str, float]], starting_money: list[int]) -> list[float]:
+    def solve_game(self, potion_valuations: list[tuple[str, float]], starting_money: list[int],
+                   batch: bool = False, verbose: bool = False,
+                   on_transaction: Optional[Callable[[tuple], None]] = None) -> list[float]:
         """
         Uses the starting money to buy and sell potions for the amount of money left at the
         end of each played day.
 
+        The potions are ranked by profit ratio once (see __rank_potions), best first. Every
+        day then buys down that ranking, taking the whole stock of each potion until the
+        money left cannot cover a stock, which is bought partially to finish the day.
+        All days share the same ranking, so no day has to search the ratio tree again.
+        In batch mode the days are answered together instead, see __solve_batch.
+
+        Nothing is printed or recorded unless asked for. Every purchase can be reported to
+        on_transaction as the tuple (day, name, litres, vendor_buy_price, valuation, money_left),
+        where day is the index into starting_money; passing a list's append method collects
+        the trade log. verbose prints every day and purchase to stdout.
+
         :param arg1: potion_valuations: is a list of potions that each vendor is selling, paired with its valuation
                            by the adventurers
         :param arg2: starting_money: is a list containing, for each attempt, the starting allowance the player has.
+        :param arg3: batch: answer every day with a binary search over cumulative costs rather
+                           than buying potion by potion. Ignored when verbose or on_transaction is
+                           given, as batch mode does not visit the purchases one by one.
+        :param arg4: verbose: print each day and each purchase as the day progresses
+        :param arg5: on_transaction: callback receiving a record for each purchase
         :pre: potion_valuations is not empty, and is a list of tuple[str, float], starting money is a list of ints
         :raises ValueError: if potion_valuations is empty
 
-        :complexity best case: 𝐎(𝑁 + 𝑀) - where the O(N) is the n length of
-            the potion_valuation that is being iterated through. The best case
-            complexity for insertion and searcg a binary search tree is O(1)
-            where the tree is empty or the searching key is at the tree root.
-        :complexity worst case: 𝐎(𝑁 x log(N) + 𝑀 × N) - the O(N) for the n length of potion_valuation remains
-            the same but the insertion into the BST becomes log(N) where the tree is balanced and sorted
-            so the given key can be found by comparing keys. This is the same complexity for searching
-            where the tree is sorted and balanced
+        :complexity best case: O(N x log(N) + M) - where N is the length of potion_valuations.
+            Ranking inserts every potion into an AVL tree, O(log(N)) each, and walks it once.
+            Each of the M days stops after its first purchase when the money runs out there.
+        :complexity worst case: O(N x log(N) + M x N) - the ranking is the same, and each day
+            walks the whole ranking when the money outlasts every stock.
+            In batch mode, O(N x log(N) + M x log(N)), see __solve_batch.
         """
 
         day_profits = []
-        ratio_tree = AVLTree()
         try:
             if len(potion_valuations) == 0:
                 raise ValueError(f"List has length: {len(potion_valuations)}")
@@ -137,88 +209,30 @@ class Game:
         except Exception as e:
             print(f"Error: {type(e)}: {e}")
             return day_profits
-        """
-        This for loop goes through each potion_valuation and creates the binary tree.
-        
-        :pre: this list of potion_valuation must contain 1 or more elements
-        :raises ValueError: if the list is empty
-        
-        This solution requires for each value of the potion_valuation have a profit 
-        ratio calculated. This is then used as its key to be inserted into a sorted 
-        AVL tree as a tuple with a boolean value. To solve the issue of duplicates, 
-        if the tree contains the key already, it simply changes the boolean in the 
-        tuple to True and creates a stack to store each potion with the same key.
-        """
-
-        for i in range(len(potion_valuations)):
 
-            name, valuation = potion_valuations[i] # splitting potion_valuation by line
-            vendor_buy_price = self.potion_table[name].buy_price
-            profit_margin = valuation - vendor_buy_price
-            ratio = profit_margin / vendor_buy_price  # profit ratio using the name from the hash table
-            quantity = self.potion_table[name].quantity
-
-            if ratio not in ratio_tree:     # checks if the key ratio already exists
-                ratio_tree[ratio] = (False, (name, vendor_buy_price, valuation, profit_margin, ratio, quantity))      # if key node is empty, add a tuple with False and the potion details
-            else:
-                tree_stack = LinkedStack()      # if duplicate exists, create linked stack
-                current_potion = ratio_tree[ratio][1] # save the current potion details in that key
-                del ratio_tree[ratio]       # delete the key to avoid duplicate error
-                tree_stack.push(current_potion)     # push the current potion into the empty stack
-                tree_stack.push((name, vendor_buy_price, valuation, profit_margin, ratio, quantity))    # push the new potion into the stack
-                ratio_tree[ratio] = (True, tree_stack)      # insert the tuple of True and stack to indicate it is a duplicate
+        ranked_potions = self.__rank_potions(potion_valuations)
+        if batch and not verbose and on_transaction is None:
+            return self.__solve_batch(ranked_potions, starting_money)
 
         """
             Iterates through the money values for each day and calculates the money remaining 
-            at the end of each iteration(day). Prints each transaction as the day progresses
-            :pre: the tree must exist and its root must not be None
-            :raises Exception: if the tree does not exist
+            at the end of each iteration(day). Reports each transaction as the day progresses
+            if verbose is set or on_transaction is given.
             :pre: there must be integer values in starting_money list
-            :raises Exception: if the list has not been defined
         """
-        try:
-            if ratio_tree.root is None:
-                raise TypeError("Ratio tree does not exist")
-        except Exception as e:
-            print(f"Error: {type(e)}: {e}")
-            return day_profits
-
-        for money in starting_money:
+        for day in range(len(starting_money)):
 
-            checked = []
-            temp_stack = LinkedStack()
+            money = starting_money[day]
             final_money = 0
-            print(f"\nStarting Day Money: {money}")
-
-            while money > 0 and len(checked) < len(ratio_tree):
-                max_ratio = ratio_tree.get_minimal(ratio_tree.root).key
-                # loops through the ratio tree for the maximum ratio and extracts it from the tree
-                for ratio in ratio_tree:
-                    if ratio >= max_ratio and not (ratio in checked):
-                        max_ratio = ratio
-                best_ratio_item = ratio_tree[max_ratio]
-
-                # Checks the number to see if its first element is true. This means it's a duplicate
-                # and it will then store the stack and pop off its first element. In doing so it also
-                # pushes this popped element into the temp_stack. If False then continues to store the
-                # potion tuple and add its ratio to the checked list.
-                if best_ratio_item[0]:
-                    original_stack = best_ratio_item[1]
-                    item = original_stack.pop()
-                    temp_stack.push(item)
-
-                    # checks after popping, if the stack is empty. Adds the ratio to the checked list
-                    # and deletes the redundant node at that key with the empty stack before readding
-                    # it with the full temp_stack
-                    if original_stack.is_empty():
-                        checked.append(max_ratio)
-                        del ratio_tree[max_ratio]
-                        ratio_tree[max_ratio] = (True, temp_stack)
-                else:
-                    checked.append(max_ratio)
-                    item = best_ratio_item[1]
+            if verbose:
+                print(f"\nStarting Day Money: {money}")
+
+            # walks the ranking from the best ratio to the worst until the money runs out
+            index = 0
+            while money > 0 and index < len(ranked_potions):
+                item = ranked_potions[index]
+                index += 1
 
-                print(f"Potion bought: {item}")
                 name, vendor_buy_price, valuation, profit_margin, ratio, quantity = item  # split item into its parts
 
                 # checks if there is money remaining after buying the whole inventory of that potion.
@@ -227,17 +241,95 @@ class Game:
                 # equal 0
                 if money >= quantity * vendor_buy_price:
                     final_money += quantity * valuation
-                    print(f"Bought the whole stock: {quantity}L for ${vendor_buy_price} each\n")
                     money -= quantity * vendor_buy_price
-                    print(f"Money left: {money}")
+                    litres = quantity
+                    if verbose:
+                        print(f"Potion bought: {item}")
+                        print(f"Bought the whole stock: {quantity}L for ${vendor_buy_price} each\n")
+                        print(f"Money left: {money}")
                 else:
-                    if best_ratio_item[0]:
-                        original_stack.push(item)
-                    new_quantity = money / vendor_buy_price
-                    print(f"Went broke buying: {new_quantity}L for ${vendor_buy_price} each\n")
-                    final_money += new_quantity * valuation
+                    litres = money / vendor_buy_price
+                    final_money += litres * valuation
                     money = 0
+                    if verbose:
+                        print(f"Potion bought: {item}")
+                        print(f"Went broke buying: {litres}L for ${vendor_buy_price} each\n")
+
+                if on_transaction is not None:
+                    on_transaction((day, name, litres, vendor_buy_price, valuation, money))
+
+            day_profits.append(final_money)
+
+        return day_profits
+
+    def __rank_potions(self, potion_valuations: list[tuple[str, float]]) -> list[tuple]:
+        """
+        Ranks the potions in potion_valuations from the best profit ratio to the worst.
+        Every potion is described by the tuple
+        (name, vendor_buy_price, valuation, profit_margin, ratio, quantity).
+
+        Each potion is inserted into a multimap AVL tree with its profit ratio as the key,
+        equal ratios keeping their insertion order. The tree is then walked once from the
+        largest ratio to the smallest with its reverse iterator, so that later potions with
+        an equal ratio come first.
+
+        :pre: potion_valuations is not empty and every name is in the potion table
+        :complexity: O(N x log(N)) best and worst, where N is the length of potion_valuations
+        :return: list of potion tuples sorted by descending profit ratio
+        """
+        # one lookup in the hash table for each potion, in a single pass
+        potion_objects = self.potion_table.get_many([name for name, _ in potion_valuations])
+        ratio_tree = AVLTree(multimap=True)
+        for i in range(len(potion_valuations)):
+
+            name, valuation = potion_valuations[i] # splitting potion_valuation by line
+            vendor_buy_price = potion_objects[i].buy_price
+            profit_margin = valuation - vendor_buy_price
+            ratio = profit_margin / vendor_buy_price  # profit ratio using the potion from the hash table
+            quantity = potion_objects[i].quantity
+            ratio_tree[ratio] = (name, vendor_buy_price, valuation, profit_margin, ratio, quantity)
+
+        return [potion for _, potion in ratio_tree.reverse_iter()]  # descending ratios
+
+    def __solve_batch(self, ranked_potions: list[tuple], starting_money: list[int]) -> list[float]:
+        """
+        Answers every day of solve_game at once from the shared ranking.
+        Builds the cumulative cost and cumulative revenue of buying the whole stock of the
+        first i ranked potions. A day with money m buys every stock up to the last prefix
+        whose cumulative cost is at most m (found by binary search), then spends the rest
+        on part of the next stock, exactly like the day by day walk.
+
+        Money left is computed as m minus the cumulative cost rather than by subtracting
+        one stock at a time, so with non-integer prices a result can differ from the
+        day by day walk in the last floating point digit.
+
+        :pre: ranked_potions is sorted by descending profit ratio, see __rank_potions
+        :complexity: O(N + M x log(N)) best and worst, where N is the length of ranked_potions
+                     and M is the length of starting_money
+        :return: list of the money made on each day
+        """
+        # cumulative_cost[i] and cumulative_revenue[i] cover the first i ranked potions
+        cumulative_cost = [0]
+        cumulative_revenue = [0]
+        for name, vendor_buy_price, valuation, profit_margin, ratio, quantity in ranked_potions:
+            cumulative_cost.append(cumulative_cost[-1] + quantity * vendor_buy_price)
+            cumulative_revenue.append(cumulative_revenue[-1] + quantity * valuation)
+
+        day_profits = []
+        for money in starting_money:
+            if money <= 0:
+                day_profits.append(0)
+                continue
+
+            # number of potions whose whole stock can be bought, O(log(N))
+            bought = bisect_right(cumulative_cost, money) - 1
+            final_money = cumulative_revenue[bought]
+            money -= cumulative_cost[bought]
 
+            # spend what is left on part of the next potion
+            if money > 0 and bought < len(ranked_potions):
+                name, vendor_buy_price, valuation, profit_margin, ratio, quantity = ranked_potions[bought]
+                final_money += money / vendor_buy_price * valuation
             day_profits.append(final_money)
 
         return day_profits
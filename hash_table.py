@@ -1,7 +1,15 @@
 """ Hash Table ADT
 
-Defines a Hash Table using Linear Probing for conflict resolution.
-It currently rehashes the primary cluster to handle deletion.
+Defines a Hash Table using open addressing for conflict resolution, by
+linear probing, quadratic probing or double hashing.
+Deleted entries are replaced by a tombstone so that the probe chains
+through them stay intact, and tombstones are cleared by rehashing.
+The table grows to the next prime size once its load factor is reached,
+moving the entries across a few at a time on later insertions.
+The full hash of every entry is kept next to it, so probing compares keys
+only when their hashes match, and moving entries never hashes a key again.
+Statistics are collected at the level asked for: none, the conflict and
+probe counters, or in detail.
 """
 __author__ = 'Brendon Taylor, modified by Jackson Goerner'
 __docformat__ = 'reStructuredText'
@@ -9,33 +17,137 @@ __modified__ = '21/05/2020'
 __since__ = '14/05/2020'
 
 from potion import Potion
+from primes import next_prime
 from referential_array import ArrayR
 from typing import TypeVar, Generic
+import math
+import time
 
 T = TypeVar('T')
 
+# Number of slots of the old table moved into the new table by every insertion during a rehash
+REHASH_STEP = 4
+
+# Marks the slot of a deleted entry. Probing carries on past it, insertion may reuse it
+TOMBSTONE = object()
+
+# Probing strategies of LinearProbePotionTable: the offset from the home position grows
+# by 1 at every step (LINEAR), by 1, 3, 5, ... giving the squares (QUADRATIC), or by a
+# step taken from the full hash of the key (DOUBLE)
+LINEAR = 'linear'
+QUADRATIC = 'quadratic'
+DOUBLE = 'double'
+
+# Statistics levels of LinearProbePotionTable: nothing is recorded (NO_STATS), the conflict
+# and probe counters (COUNTERS), or those along with a histogram of probe lengths and the
+# time taken by each operation (DETAILED)
+NO_STATS = 'none'
+COUNTERS = 'counters'
+DETAILED = 'detailed'
+
+# Modulus of the full hash of a key, a Mersenne prime. The position of a key is its full hash modulo the table size
+HASH_MODULUS = (1 << 31) - 1
+
+
+def mix_hash(value: int) -> int:
+    """
+    Scrambles the bits of a polynomial hash into a 64 bit full hash (the SplitMix64
+    finaliser), so that names differing only in their last few characters do not land
+    on neighbouring positions of every table size.
+    :complexity: O(1)
+    """
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return value ^ (value >> 31)
+
 
 class LinearProbePotionTable(Generic[T]):
     """
     Linear Probe Potion Table
 
-    This potion table does not support deletion.
+    Probes linearly by default. With probing=QUADRATIC the i-th probe is i
+    squared slots from the home position, and with probing=DOUBLE it is i
+    times a step of 1 to table_size - 1 slots, taken from the bits of the full
+    hash above those that give the home position (its quotient by table_size).
+    These only reach every slot of a table of prime size, so with them the
+    initial size is rounded up to a prime (the sizes the table grows to are
+    primes already), and quadratic probing only reaches half of the slots, so
+    it needs a max_load_factor of at most 0.5.
+
+    The double hashing step is not an independent hash of the name: it comes
+    from the same stored full hash as the home position, so that moving an
+    entry never hashes its key again. With the good hash, the 64 mixed bits
+    above the position make it as good as an independent one. The bad hash
+    is only the code of the first character, which gives a quotient of 0 in
+    any table larger than that, so every step is 1 and DOUBLE probes exactly
+    as LINEAR does.
+
+    Deletion replaces the entry with TOMBSTONE, which lookups probe past and
+    insertions reuse. Tombstones count towards the load factor, so once they
+    build up the next insertion starts a rehash that leaves them behind,
+    into a table of the same size when the live entries alone do not need
+    a bigger one.
+
+    Once an insertion would take the table past max_load_factor, a new table
+    of the next prime size above twice the current size is allocated. The
+    entries of the old table are then moved REHASH_STEP slots at a time by the
+    following insertions, so no single insertion pays for the whole rehash.
+    Until the move is finished, lookups search the new table and then the
+    part of the old table that has not been moved yet.
+
+    With stats=NO_STATS the operations record nothing, and statistics() stays
+    at zero. COUNTERS, the default, keeps conflict_count, probe_total and
+    probe_max. DETAILED also counts how many probes stopped after each number
+    of steps, and times every lookup, insertion and deletion, see
+    detailed_statistics(). The distribution of cluster lengths is worked out
+    from the table when asked for, so it costs the operations nothing.
+
+    The full hash of each entry is stored in the parallel array hashes. A
+    probe compares it with the hash of the key before comparing the keys
+    themselves, so the long names sharing a prefix ("Potion of ...") met on a
+    probe chain are mostly told apart by one integer comparison. Moving an
+    entry takes its position from the stored hash.
 
     attributes:
         count: number of elements in the hash table
         table: used to represent our internal array
+        hashes: the full hash of the entry in each slot of table
         table_size: current size of the hash table
+        old_table: the array being moved into table, None when not rehashing
+        old_hashes: the full hashes of the entries of old_table
+        rehash_index: the slots of old_table below this index have been moved
+        tombstone_count: number of tombstones in table
+        max_load_factor: fraction of table_size that can be used before growing
+        probing: the probing strategy, LINEAR, QUADRATIC or DOUBLE
+        stats: the statistics level, NO_STATS, COUNTERS or DETAILED
+        probe_lengths: number of probes that stopped after each number of steps, when DETAILED
+        timings: count and total seconds of each operation, 'get', 'set' and 'delete', when DETAILED
     """
 
-    def __init__(self, max_potions: int, good_hash: bool = True, tablesize_override: int = -1) -> None:
+    def __init__(self, max_potions: int, good_hash: bool = True, tablesize_override: int = -1,
+                 max_load_factor: float = 0.5, probing: str = LINEAR, stats: str = COUNTERS) -> None:
+        if not 0 < max_load_factor <= 1:
+            raise ValueError("Load factor must be in (0, 1]")
+        if probing not in (LINEAR, QUADRATIC, DOUBLE):
+            raise ValueError(f"Unknown probing strategy: {probing}")
+        if probing == QUADRATIC and max_load_factor > 0.5:
+            raise ValueError("Quadratic probing needs a load factor of at most 0.5")
+        if stats not in (NO_STATS, COUNTERS, DETAILED):
+            raise ValueError(f"Unknown statistics level: {stats}")
+        self.probing = probing
+
         # Statistic setting
+        self.stats = stats
         self.conflict_count = 0
         self.probe_max = 0
         self.probe_total = 0
+        self.probe_lengths = {}
+        self.timings = {'get': [0, 0.0], 'set': [0, 0.0], 'delete': [0, 0.0]}
 
         self.count = 0
         self.table = None
         self.table_size = 0
+        self.max_load_factor = max_load_factor
 
         self.useHash = False
 
@@ -49,13 +161,27 @@ class LinearProbePotionTable(Generic[T]):
 
     def hash(self, potion_name: str) -> int:
         """
-        Hashes the potions name using either good hash or bad hash
-        :complexity: O(1) where checking use.hash and hashing is constant
+        Hashes the potions name using either good hash or bad hash, into the full hash
+        of the name. It does not depend on the table size: the position of the name in
+        a table is its full hash modulo the size of that table.
+        :complexity: O(K) where K is the length of the name for good hash, O(1) for bad hash
         """
         if self.useHash:
-            return Potion.good_hash(potion_name, self.table_size)  # added a getter to the Potion class, unsure if this works
+            return mix_hash(Potion.good_hash(potion_name, HASH_MODULUS))
         else:
-            return Potion.bad_hash(potion_name, self.table_size)
+            return Potion.bad_hash(potion_name, HASH_MODULUS)
+
+    def __first_increment(self, key_hash: int, tablesize: int) -> int:
+        """
+        Returns the distance from the home position of a key to its second probe, in a
+        table of the given size. Later increments stay the same, except for quadratic
+        probing where they grow by 2 each time. For double hashing it is 1 whenever
+        key_hash is smaller than tablesize, as with the bad hash, see the class docstring.
+        :complexity: O(1)
+        """
+        if self.probing == DOUBLE and tablesize > 1:
+            return 1 + (key_hash // tablesize) % (tablesize - 1)
+        return 1
 
     def statistics(self) -> tuple:
         """
@@ -70,6 +196,84 @@ class LinearProbePotionTable(Generic[T]):
 
         return stat_tuple
 
+    def cluster_statistics(self) -> tuple:
+        """
+        Creates a tuple with the tombstone_count, the number of clusters and the
+        length of the longest cluster in the table, where a cluster is a run of
+        slots holding an entry or a tombstone.
+        :complexity: O(N) where N is the table_size
+        """
+        lengths = self.__cluster_lengths()
+        return (self.tombstone_count, len(lengths), max(lengths, default=0),)
+
+    def detailed_statistics(self) -> dict:
+        """
+        Creates a dictionary of the statistics collected at the DETAILED level:
+            'probe_lengths': {steps: number of probes that stopped after that many steps}
+            'timings': {operation: (count, total seconds, mean seconds)} for 'get', 'set' and 'delete'
+            'clusters': {length: number of clusters of that length}, for any level
+        :complexity: O(N) where N is the table_size, to measure the clusters
+        """
+        clusters = {}
+        for length in self.__cluster_lengths():
+            clusters[length] = clusters.get(length, 0) + 1
+        timings = {}
+        for operation, (count, seconds) in self.timings.items():
+            timings[operation] = (count, seconds, seconds / count if count > 0 else 0.0)
+        return {'probe_lengths': dict(self.probe_lengths), 'timings': timings, 'clusters': clusters}
+
+    def __cluster_lengths(self) -> list[int]:
+        """
+        Returns the length of every cluster of the table, see cluster_statistics.
+        :complexity: O(N) where N is the table_size
+        """
+        # start scanning just after an empty slot, so no cluster wraps around the scan
+        start = 0
+        while start < self.table_size and self.table[start] is not None:
+            start += 1
+        if start == self.table_size:  # no empty slot, the whole table is one cluster
+            return [self.table_size]
+
+        lengths = []
+        length = 0
+        for offset in range(1, self.table_size + 1):
+            if self.table[(start + offset) % self.table_size] is None:
+                if length > 0:
+                    lengths.append(length)
+                length = 0
+            else:
+                length += 1
+        return lengths
+
+    def __record_probe(self, steps: int, reached_empty: bool) -> None:
+        """
+        Adds a probe that stopped after the given number of steps to the statistics.
+        A probe that had to go on to an empty slot counts as a conflict if it took any
+        step, and for probe_max.
+        :pre: statistics are collected
+        :complexity: O(1)
+        """
+        self.probe_total += steps
+        if reached_empty:
+            if steps > 0:
+                self.conflict_count += 1
+            if self.probe_max < steps:
+                self.probe_max = steps
+        if self.stats == DETAILED:
+            self.probe_lengths[steps] = self.probe_lengths.get(steps, 0) + 1
+
+    def __timed(self, operation: str, method, *args):
+        """
+        Calls method with args, adding its running time to the timings of operation.
+        :complexity: that of method
+        """
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self.timings[operation][0] += 1
+            self.timings[operation][1] += time.perf_counter() - start
+
     def __len__(self) -> int:
         """
         Returns number of elements in the hash table
@@ -77,42 +281,92 @@ class LinearProbePotionTable(Generic[T]):
         """
         return self.count
 
-    def __linear_probe(self, key: str, is_insert: bool) -> int:
+    def __linear_probe(self, key: str, key_hash: int, is_insert: bool, old: bool = False,
+                       record: bool = True) -> int:
         """
-        Find the correct position for this key in the hash table using linear probing
+        Find the correct position for this key in the hash table, probing by the strategy
+        of the table (linear, quadratic or double hashing), see the class docstring.
+        :param key_hash: the full hash of key, see hash(potion_name)
+        :param old: probe old_table rather than table
+        :param record: count the probe in the statistics
         :complexity best: O(K) first position is empty
                           where K is the size of the key
         :complexity worst: O(K + N) when we've searched the entire table
-                           where N is the table_size
+                           where N is the table_size. Only slots whose stored hash
+                           equals key_hash cost a key comparison.
         :raises KeyError: When a position can't be found
         """
-        position = self.hash(key)  # get the position using hash i = 2
-
-        if is_insert and self.is_full():
-            raise KeyError(key)
+        if old:
+            table = self.old_table
+            hashes = self.old_hashes
+        else:
+            table = self.table
+            hashes = self.hashes
+        position = key_hash % len(table)
+        increment = self.__first_increment(key_hash, len(table))
+        growth = 2 if self.probing == QUADRATIC else 0
+        record = record and self.stats != NO_STATS
 
-        probe_chain = []
-        conflict_check = 0
-        for _ in range(len(self.table)):  # start traversing
-            if self.table[position] is None:  # found empty slot
-                self.conflict_count += conflict_check
-                if self.probe_max < len(probe_chain):
-                    self.probe_max = len(probe_chain)
+        steps = 0
+        first_tombstone = -1
+        for _ in range(len(table)):  # start traversing
+            entry = table[position]
+            if entry is None:  # found empty slot
+                if record:
+                    self.__record_probe(steps, True)
                 if is_insert: # trying to insert (bool)
+                    if first_tombstone != -1:  # reuse the first deleted slot on the way
+                        return first_tombstone
                     return position # returns the position of empty slot
                 else: # not trying to insert (search)
                     raise KeyError(key)  # so the key is not in the table (search function)
-            elif self.table[position][0] == key:  # found key (search function)
+            elif entry is TOMBSTONE:  # deleted entry, the key may still be further on
+                if first_tombstone == -1:
+                    first_tombstone = position
+            elif hashes[position] == key_hash and entry[0] == key:  # found key (search function)
+                if record:
+                    self.__record_probe(steps, False)
                 return position # return
-            else:  # there is something but not the key, try next (inserting item)
-                if conflict_check == 0:
-                    conflict_check = 1
-                probe_chain.append(position)
-                position = (position + 1) % len(self.table)  # next index
-                self.probe_total += 1
+            # there is something but not the key, try next (inserting item)
+            steps += 1
+            position = (position + increment) % len(table)  # next index
+            increment += growth
 
+        if record:
+            self.__record_probe(steps, False)
+        if is_insert and first_tombstone != -1:  # no empty slot, but a deleted one
+            return first_tombstone
         raise KeyError(key)
 
+    def __find_in_old_table(self, key: str, key_hash: int, record: bool = True) -> int:
+        """
+        Find the position of a key that has not been moved out of the old table yet.
+        :param record: count the probe in the statistics
+        :complexity: see __linear_probe
+        :raises KeyError: when no rehash is in progress or the key is not waiting in the old table
+        """
+        if self.old_table is None:
+            raise KeyError(key)
+        position = self.__linear_probe(key, key_hash, False, True, record)
+        if position < self.rehash_index:  # already moved into the new table
+            raise KeyError(key)
+        return position
+
+    def __holds(self, key: str, key_hash: int) -> bool:
+        """
+        Checks whether key is in the table, or waiting in the old table, without counting
+        the probes in the statistics.
+        :complexity: see __linear_probe
+        """
+        try:
+            self.__linear_probe(key, key_hash, False, record=False)
+        except KeyError:
+            try:
+                self.__find_in_old_table(key, key_hash, False)
+            except KeyError:
+                return False
+        return True
+
     def __contains__(self, key: str) -> bool:
         """
         Checks to see if the given key is in the Hash Table
@@ -131,31 +385,192 @@ class LinearProbePotionTable(Generic[T]):
         :see: #self.__linear_probe(key: str, is_insert: bool)
         :raises KeyError: when the item doesn't exist
         """
-        position = self.__linear_probe(key, False)
+        if self.stats == DETAILED:
+            return self.__timed('get', self.__get, key)
+        return self.__get(key)
+
+    def __get(self, key: str) -> T:
+        """ The body of __getitem__. """
+        key_hash = self.hash(key)
+        try:
+            position = self.__linear_probe(key, key_hash, False)
+        except KeyError:
+            position = self.__find_in_old_table(key, key_hash)
+            return self.old_table[position][1]
         return self.table[position][1]
 
     def __setitem__(self, key: str, data: T) -> None:
         """
-        Set an (key, data) pair in our hash table
+        Set an (key, data) pair in our hash table.
+        Rehashes the table first if a new key would take the entries and tombstones
+        past max_load_factor, growing it only if the entries alone need the room,
+        and moves the next REHASH_STEP slots across while a rehash is in progress.
+        A key already in the table is updated where it is, so it never causes a rehash.
         :see: #self.__linear_probe(key: str, is_insert: bool)
-        :see: #self.__contains__(key: str)
+        :see: #self.__rehash_step(steps: int)
         """
-        if len(self) == len(self.table) and key not in self:
-            raise ValueError("Cannot insert into a full table.")
-        position = self.__linear_probe(key, True)
+        if self.stats == DETAILED:
+            self.__timed('set', self.__set, key, data)
+        else:
+            self.__set(key, data)
+
+    def __set(self, key: str, data: T) -> None:
+        """ The body of __setitem__. """
+        key_hash = self.hash(key)
+        if self.count + self.tombstone_count + 1 > self.max_load_factor * self.table_size \
+                and not self.__holds(key, key_hash):
+            if 2 * (self.count + 1) > self.max_load_factor * self.table_size:
+                self.__start_rehash(next_prime(2 * self.table_size))
+            else:  # mostly tombstones, clear them out at the same size
+                self.__start_rehash(self.table_size)
 
+        if self.old_table is not None:
+            self.__rehash_step(REHASH_STEP)
+            try:
+                position = self.__find_in_old_table(key, key_hash)
+            except KeyError:
+                pass
+            else:  # the key is still waiting to be moved, update it where it is
+                self.old_table[position] = (key, data)
+                return
+
+        self.__store(self.__linear_probe(key, key_hash, True), key, key_hash, data)
+
+    def __store(self, position: int, key: str, key_hash: int, data: T) -> None:
+        """
+        Puts the entry (key, data) at a position of table found by probing for key,
+        counting it if the slot was empty or held a tombstone.
+        :complexity: O(1)
+        """
         if self.table[position] is None:
             self.count += 1
+        elif self.table[position] is TOMBSTONE:
+            self.count += 1
+            self.tombstone_count -= 1
         self.table[position] = (key, data)
+        self.hashes[position] = key_hash
+
+    def bulk_insert(self, pairs: list[tuple[str, T]]) -> None:
+        """
+        Set every (key, data) pair of pairs in our hash table, a later pair updating an
+        earlier one with the same key.
+        Any rehash in progress is finished, and the table is resized once, if needed,
+        so that all the pairs fit within max_load_factor. Each key is then hashed once
+        and probed once, with no per-insertion load checks or rehash steps.
+        :complexity: O(P x K + N) expected for a good hash, where P is the length of pairs,
+                     K the size of the keys and N the table_size after resizing
+        """
+        needed = self.count + len(pairs)
+        if needed + self.tombstone_count > self.max_load_factor * self.table_size:
+            # the smallest prime size at least as large as the current one holding every entry
+            tablesize = max(self.table_size, next_prime(math.ceil(needed / self.max_load_factor) - 1))
+            self.__start_rehash(tablesize)
+        if self.old_table is not None:
+            self.__rehash_step(len(self.old_table))
+
+        for key, data in pairs:
+            key_hash = self.hash(key)
+            self.__store(self.__linear_probe(key, key_hash, True), key, key_hash, data)
+
+    def get_many(self, keys: list[str]) -> list[T]:
+        """
+        Get the items at the given keys, in the same order, probing once for each key.
+        :see: #self.__getitem__(self, key: str)
+        :complexity: O(M x K) expected for a good hash, where M is the length of keys
+                     and K the size of the keys
+        :raises KeyError: when an item doesn't exist
+        """
+        get = self.__getitem__ if self.stats == DETAILED else self.__get
+        return [get(key) for key in keys]
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Delete the (key, data) pair with the given key, leaving a tombstone in its slot.
+        :see: #self.__linear_probe(key: str, is_insert: bool)
+        :complexity: see __linear_probe, O(1) amortised for a good hash at a bounded load factor
+        :raises KeyError: when the key doesn't exist
+        """
+        if self.stats == DETAILED:
+            self.__timed('delete', self.__delete, key)
+        else:
+            self.__delete(key)
+
+    def __delete(self, key: str) -> None:
+        """ The body of __delitem__. """
+        key_hash = self.hash(key)
+        try:
+            position = self.__linear_probe(key, key_hash, False)
+        except KeyError:
+            # not moved yet, the old table is left behind when the rehash ends
+            position = self.__find_in_old_table(key, key_hash)
+            self.old_table[position] = TOMBSTONE
+        else:
+            self.table[position] = TOMBSTONE
+            self.tombstone_count += 1
+        self.count -= 1
+
+    def __start_rehash(self, tablesize: int) -> None:
+        """
+        Allocate a new table of the given size and start moving the entries into it.
+        A rehash still in progress is finished first.
+        :complexity: O(tablesize) to allocate the new array, plus the cost of
+                     finishing a rehash still in progress
+        """
+        if self.old_table is not None:
+            self.__rehash_step(len(self.old_table))
+        self.old_table = self.table
+        self.old_hashes = self.hashes
+        self.rehash_index = 0
+        self.table_size = tablesize
+        self.table = ArrayR(tablesize)
+        self.hashes = ArrayR(tablesize)
+        self.tombstone_count = 0
+
+    def __rehash_step(self, steps: int) -> None:
+        """
+        Move the entries in the next steps slots of the old table into the new table.
+        The position of each entry comes from its stored hash, so no key is hashed again.
+        Moving entries is not counted in the conflict and probe statistics.
+        :complexity: O(steps x P) where P is the length of the probe chain in the new table
+        """
+        end = min(self.rehash_index + steps, len(self.old_table))
+        for index in range(self.rehash_index, end):
+            entry = self.old_table[index]
+            if entry is not None and entry is not TOMBSTONE:
+                key_hash = self.old_hashes[index]
+                position = key_hash % self.table_size
+                increment = self.__first_increment(key_hash, self.table_size)
+                while self.table[position] is not None and self.table[position] is not TOMBSTONE:
+                    position = (position + increment) % self.table_size
+                    if self.probing == QUADRATIC:
+                        increment += 2
+                if self.table[position] is TOMBSTONE:
+                    self.tombstone_count -= 1
+                self.table[position] = entry
+                self.hashes[position] = key_hash
+        self.rehash_index = end
+
+        if self.rehash_index == len(self.old_table):
+            self.old_table = None
+            self.old_hashes = None
+            self.rehash_index = 0
 
     def initalise_with_tablesize(self, tablesize: int) -> None:
         """
-        Initialise a new array, with table size given by tablesize.
+        Initialise a new array, with table size given by tablesize, rounded up to a
+        prime for quadratic probing and double hashing.
         Complexity: O(n), where n is len(tablesize)
         """
+        if self.probing != LINEAR:
+            tablesize = next_prime(tablesize - 1)
         self.count = 0
         self.table_size = tablesize
         self.table = ArrayR(tablesize)
+        self.hashes = ArrayR(tablesize)
+        self.old_table = None
+        self.old_hashes = None
+        self.rehash_index = 0
+        self.tombstone_count = 0
 
     def is_empty(self):
         """
@@ -185,7 +600,12 @@ class LinearProbePotionTable(Generic[T]):
         """
         result = ""
         for item in self.table:
-            if item is not None:
+            if item is not None and item is not TOMBSTONE:
                 (key, value) = item
                 result += "(" + str(key) + "," + str(value) + ")\n"
+        if self.old_table is not None:
+            for index in range(self.rehash_index, len(self.old_table)):
+                if self.old_table[index] is not None and self.old_table[index] is not TOMBSTONE:
+                    (key, value) = self.old_table[index]
+                    result += "(" + str(key) + "," + str(value) + ")\n"
         return result
@@ -1,4 +1,7 @@
-""" Implementation of a node in linked lists and binary search trees. """
+""" Implementation of a node in linked lists and binary search trees.
+    Nodes declare their attributes in __slots__, so that they do not carry a
+    per-instance __dict__.
+"""
 
 from typing import TypeVar, Generic
 
@@ -13,6 +16,8 @@ __docformat__ = 'reStructuredText'
 class ListNode(Generic[T]):
     """ Simple linked node. It contains an item and has a reference to next node. """
 
+    __slots__ = ('item', 'next')
+
     def __init__(self, item: T = None) -> None:
         """ Node initialiser. """
         self.item = item
@@ -21,6 +26,8 @@ class ListNode(Generic[T]):
 class TreeNode(Generic[K, I]):
     """ Node class represent BST nodes. """
 
+    __slots__ = ('key', 'item', 'left', 'right')
+
     def __init__(self, key: K, item: I = None) -> None:
         """
             Initialises the node with a key and optional item
@@ -43,9 +50,12 @@ class TreeNode(Generic[K, I]):
 
 class AVLTreeNode(TreeNode, Generic[K, I]):
     """ Node class for AVL trees.
-        Objects of this class have an additional variable - height.
+        Objects of this class have two additional variables - height, and
+        size, the number of nodes in the sub-tree rooted at this node.
     """
 
+    __slots__ = ('height', 'size')
+
     def __init__(self, key: K, item: I = None) -> None:
         """
             Initialises the node with a key and optional item
@@ -55,3 +65,4 @@ class AVLTreeNode(TreeNode, Generic[K, I]):
 
         super(AVLTreeNode, self).__init__(key, item)
         self.height = 1
+        self.size = 1
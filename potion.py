@@ -3,6 +3,11 @@ from primes import largest_prime
 
 class Potion:
 
+    # Base of the polynomial string hash used by good_hash, found once when the class is created
+    HASH_BASE = largest_prime(52459)
+    # Number of characters good_hash takes between reductions modulo the table size
+    HASH_CHUNK = 8
+
     def __init__(self, potion_type: str, name: str, buy_price: float, quantity: float) -> None:
         """
         Init method to initialise Potion Objects
@@ -24,16 +29,22 @@ class Potion:
     def good_hash(cls, potion_name: str, tablesize: int) -> int:
         """
         Method that hashes a position for a given string and tablesize. This uses
-        a universal hash method to prevent collisions and conflicts
-        :complexity: O(1) where char is the first letter of the string
+        a polynomial hash with a prime base (HASH_BASE) to spread out collisions and conflicts
+        The modulo is taken every HASH_CHUNK characters rather than at every one, which
+        gives the same value with a division per chunk. Between reductions the value stays
+        below tablesize x HASH_BASE ** HASH_CHUNK, so each step costs O(1) however long the name.
+        :complexity: O(K) where K is the length of the string
         """
         value = 0
-        a = largest_prime(52459)
-        b = largest_prime(27183)
+        a = cls.HASH_BASE
+        pending = 0
         for char in potion_name:
-            value = (ord(char) + a * value) % tablesize
-        a = a * b % (tablesize - 1)
-        return value
+            value = ord(char) + a * value
+            pending += 1
+            if pending == cls.HASH_CHUNK:
+                value %= tablesize
+                pending = 0
+        return value % tablesize
 
     @classmethod
     def bad_hash(cls, potion_name: str, tablesize: int) -> int:
@@ -1,37 +1,89 @@
+from math import isqrt
+
+# Sieve of Eratosthenes shared by every query: _sieve[i] == 1 if and only if i is prime.
+# It covers the integers below len(_sieve) and is extended one segment at a time when a
+# query needs more, so repeated queries reuse the work of earlier ones.
+_sieve = bytearray(2)
+
+
+def _extend_sieve(limit: int) -> None:
+    """
+    Extend the shared sieve so that it covers every integer below limit.
+    The sieve at least doubles in size every time it is extended, and the new segment
+    is crossed off using the primes already in the sieve.
+    :post: len(_sieve) >= limit
+    :complexity: best O(1) when the sieve already covers limit, worst O(L log(log L)) where
+                 L is the new length of the sieve, amortised O(log(log L)) per integer covered
+    """
+    if limit <= len(_sieve):
+        return
+    limit = max(limit, 2 * len(_sieve))
+    _extend_sieve(isqrt(limit - 1) + 1)  # every prime up to sqrt(limit) is needed below
+
+    start = len(_sieve)
+    segment = bytearray(b'\x01') * (limit - start)
+    p = _sieve.find(1)
+    while p != -1 and p * p < limit:
+        # Cross off the multiples of p in the segment
+        first = max(p * p, (start + p - 1) // p * p)
+        segment[first - start::p] = bytes(len(range(first - start, limit - start, p)))
+        p = _sieve.find(1, p + 1)
+    _sieve.extend(segment)
+
+
 def largest_prime(k: int) -> int:
     """
     A function designed to return the largest prime number less than k.
-    Implemented using the Sieve of Eratosthenes algorithm.
+    Implemented using the Sieve of Eratosthenes algorithm, on a sieve shared with
+    the other queries of this module.
     :pre: k must be an integer >= 3
     :post: the integer returned is strictly less than k
     :raises ValueError: if k < 3
     :raises TypeError: if k is not integer
-    :complexity: best and worst O(N log(log N)) where N is the value of k
+    :complexity: best O(G) once the sieve covers k, where G is the gap between k and the
+                 prime returned (O(log k) on average), worst O(N log(log N)) where N is the
+                 value of k when the sieve has to be extended
     :return: the largest prime number strictly less than k
     """
 
     try:
         if k < 3:
             raise ValueError("Input must be >= 3")
-        primes_list = [True for i in range(k)]
-        p = 2
-
-        while p ** 2 <= k:
+        _extend_sieve(k)
+        return _sieve.rfind(1, 0, k)
 
-            # If prime[p] is not changed, then it is a prime
-            if primes_list[p]:
-
-                # Update all multiples of p
-                for i in range(p ** 2, k, p):
-                    primes_list[i] = False
+    except Exception as e:
+        print(f"Error {type(e)}: {e}")
 
-            p += 1
 
-        primes_list[0] = False
-        primes_list[1] = False
+def next_prime(k: int) -> int:
+    """
+    A function designed to return the smallest prime number greater than k.
+    Searches the shared sieve, extending it until a prime above k is found.
+    :pre: k must be an integer
+    :post: the integer returned is strictly greater than k
+    :complexity: best O(G) once the sieve covers the answer, where G is the gap between k
+                 and the prime returned (O(log k) on average), worst O(N log(log N)) where
+                 N is the value of k when the sieve has to be extended
+    :return: the smallest prime number strictly greater than k
+    """
+    start = max(k + 1, 2)
+    _extend_sieve(start + 1)
+    prime = _sieve.find(1, start)
+    while prime == -1:
+        _extend_sieve(2 * len(_sieve))
+        prime = _sieve.find(1, start)
+    return prime
 
-        # Print all prime numbers
-        return max([i for i, b in enumerate(primes_list) if b])
 
-    except Exception as e:
-        print(f"Error {type(e)}: {e}")
+def is_prime(n: int) -> bool:
+    """
+    Checks whether n is a prime number, using the shared sieve.
+    :pre: n must be an integer
+    :complexity: best O(1) once the sieve covers n, worst O(N log(log N)) where N is the
+                 value of n when the sieve has to be extended
+    """
+    if n < 2:
+        return False
+    _extend_sieve(n + 1)
+    return _sieve[n] == 1
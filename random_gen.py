@@ -1,5 +1,12 @@
+from array import array
+from math import isqrt
 from typing import Generator
 
+# Parameters of the linear congruential generator behind RandomGen
+MODULUS = pow(2, 32)
+MULTIPLIER = 134775813
+INCREMENT = 1
+
 
 def lcg(modulus: int, a: int, c: int, seed: int) -> Generator[int, None, None]:
     """Linear congruential generator."""
@@ -8,42 +15,125 @@ def lcg(modulus: int, a: int, c: int, seed: int) -> Generator[int, None, None]:
         yield seed
 
 
+def affine_power(n: int) -> tuple[int, int]:
+    """
+    Returns (mult, inc) such that n steps of the generator take x to (mult * x + inc) % MODULUS.
+    Composes the affine step x -> MULTIPLIER * x + INCREMENT with itself n times by
+    repeated squaring.
+    :pre: n >= 0
+    :complexity: O(log(n))
+    """
+    # (mult, inc) is the step applied so far, (square_mult, square_inc) the current power of two
+    mult, inc = 1, 0
+    square_mult, square_inc = MULTIPLIER, INCREMENT
+    while n > 0:
+        if n & 1:
+            mult, inc = (square_mult * mult) % MODULUS, (square_mult * inc + square_inc) % MODULUS
+        square_mult, square_inc = (square_mult * square_mult) % MODULUS, (square_mult * square_inc + square_inc) % MODULUS
+        n >>= 1
+    return mult, inc
+
+
 class RandomGen:
     """
     Class that returns a randomly generated number
+    The linear congruential generator is stepped directly on self.state, the
+    last number it produced (the seed before the first draw), so that the
+    stream can be drawn from in bulk and jumped ahead.
     """
     def __init__(self, seed: int = 0) -> None:
         self.seed = seed
-        self.randgen = lcg(pow(2, 32), 134775813, 1, seed)
+        self.state = seed % MODULUS
+
+    def jump(self, n: int) -> None:
+        """
+        Advances the generator n steps, as if n numbers had been drawn from it.
+        :pre: n >= 0
+        :complexity: O(log(n)), see affine_power
+        """
+        if n < 0:
+            raise ValueError("Cannot jump backwards")
+        mult, inc = affine_power(n)
+        self.state = (mult * self.state + inc) % MODULUS
 
     def randint(self, k: int) -> int:
         """
         returns a random integer
+        Draws five numbers from the generator and takes the bitwise majority (at
+        least 3 of 5) of their 16 most significant bits, modulo k.
         :param k: positive non-zero integer
         :return: random number in range (1,k) inclusive
-        :complexity: O(N) where N is the length of the randlist
+        :complexity: O(1), the majority is computed on all 16 bits at once with integer operations
         """
         if k == 0:
             return 0
-        randlist = []
-        for i in range(0, 5):
-            binary_num = bin(next(self.randgen))  # Convert to binary
-            processed_num = binary_num[2:].zfill(32)  # Remove 0b from the start
-            shifted_num = processed_num[0:16]  # Grab the 16 MSB of processed_num
-            randlist.append(shifted_num)
-
-        new_num = [0 for _ in range(16)]
-        for i in range(16):
-            count = 0
-            for j in range(len(randlist)):
-                if randlist[j][i] == "1":
-                    count += 1
-
-                if count >= 3:
-                    new_num[i] = "1"
-                else:
-                    new_num[i] = "0"
-
-        new_num = int("".join(new_num), 2)
+        # Grab the 16 MSB of each 32 bit number
+        x = (MULTIPLIER * self.state + INCREMENT) % MODULUS
+        a = x >> 16
+        x = (MULTIPLIER * x + INCREMENT) % MODULUS
+        b = x >> 16
+        x = (MULTIPLIER * x + INCREMENT) % MODULUS
+        c = x >> 16
+        x = (MULTIPLIER * x + INCREMENT) % MODULUS
+        d = x >> 16
+        x = (MULTIPLIER * x + INCREMENT) % MODULUS
+        e = x >> 16
+        self.state = x
+
+        # A bit is set in at least 3 of the 5 numbers if it is set in both a and b and one of
+        # c, d, e, in one of a and b and two of c, d, e, or in all of c, d and e
+        new_num = (a & b & (c | d | e)) | ((a | b) & ((c & d) | (c & e) | (d & e))) | (c & d & e)
         output = (new_num % k) + 1
         return output
+
+    def randints(self, k: int, n: int) -> array:
+        """
+        returns n random integers, the same numbers as n calls to randint(k)
+        Both steps of randint are done for many numbers at once by packing them into
+        one large integer, so that each integer operation below works on all of them:
+        - the 5n draws are split into lanes of consecutive draws, each lane 64 bits wide,
+          and every lane is advanced by the number of lanes with a single multiplication
+        - the majority vote is taken on the packed 16 bit halves of the five draws
+        :param k: positive non-zero integer
+        :param n: number of random integers to return
+        :return: array('H') of random numbers in range (1,k) inclusive, array('L') if k > 65535
+        :complexity: O(n)
+        """
+        typecode = 'H' if k <= 0xFFFF else 'L'
+        if k == 0 or n == 0:
+            return array(typecode, bytes(n * array(typecode).itemsize))
+
+        draws = 5 * n
+        lanes = isqrt(draws)
+        rounds = -(-draws // lanes)
+
+        # the first draw of every lane, one step apart
+        first = array('Q', bytes(8 * lanes))
+        x = self.state
+        for j in range(lanes):
+            x = (MULTIPLIER * x + INCREMENT) % MODULUS
+            first[j] = x
+        packed = int.from_bytes(first.tobytes(), 'little')
+
+        # lane j moves from draw r * lanes + j to draw (r + 1) * lanes + j in one step.
+        # Each lane stays below 2 ** 64 before the mask, so lanes never spill into each other
+        mult, inc = affine_power(lanes)
+        packed_inc = int.from_bytes(array('Q', [inc] * lanes).tobytes(), 'little')
+        low_mask = int.from_bytes(array('Q', [MODULUS - 1] * lanes).tobytes(), 'little')
+        half_mask = int.from_bytes(array('Q', [0xFFFF] * lanes).tobytes(), 'little')
+
+        halves = array('H')
+        for r in range(rounds):
+            # the 16 MSB of every 32 bit draw, in the lowest 16 bits of its lane
+            halves.frombytes(((packed >> 16) & half_mask).to_bytes(8 * lanes, 'little'))
+            packed = (packed * mult + packed_inc) & low_mask
+        halves = halves[::4][:draws]
+        self.jump(draws)
+
+        # one large integer per draw of randint, holding that draw for all n numbers
+        a, b, c, d, e = [int.from_bytes(halves[j::5].tobytes(), 'little') for j in range(5)]
+        majority = (a & b & (c | d | e)) | ((a | b) & ((c & d) | (c & e) | (d & e))) | (c & d & e)
+
+        new_nums = array('H')
+        new_nums.frombytes(majority.to_bytes(2 * n, 'little'))
+        return array(typecode, [(new_num % k) + 1 for new_num in new_nums])
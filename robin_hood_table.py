@@ -0,0 +1,298 @@
+""" Hash Table ADT
+
+Defines a Hash Table using Robin Hood hashing for conflict resolution.
+It is linear probing in which an insertion takes the slot of any entry
+that is closer to its home position than the new entry is to its own,
+and carries on with the entry it displaced. This keeps the probe lengths
+of all entries close to each other, rather than letting a few entries at
+the end of a cluster probe for a long way.
+"""
+__docformat__ = 'reStructuredText'
+
+from hash_table import HASH_MODULUS, mix_hash
+from potion import Potion
+from primes import next_prime
+from referential_array import ArrayR
+from typing import TypeVar, Generic
+
+T = TypeVar('T')
+
+
+class RobinHoodPotionTable(Generic[T]):
+    """
+    Robin Hood Potion Table, with the same interface as LinearProbePotionTable.
+
+    The distance of an entry from its home position (its full hash modulo
+    table_size) is worked out from its stored full hash. A lookup can stop as
+    soon as it reaches an entry closer to home than it is itself, as the key
+    would have displaced that entry had it been inserted. Deletion shifts the
+    entries after the deleted one back by a slot until one is at home, so the
+    table needs no tombstones.
+
+    Once an insertion would take the table past max_load_factor, every entry
+    is moved at once into a table of the next prime size above twice the
+    current size.
+
+    The statistics are counted as for LinearProbePotionTable: every probe adds
+    the slots it stepped over to probe_total, and the insertions and failed
+    lookups that probed past their home position count as conflicts
+    (conflict_count), the most slots stepped over by one of them being
+    probe_max. An insertion that displaces entries counts every slot it steps
+    over, carrying each entry on. displacement_max is kept apart: the largest
+    distance from its home position at which an insertion placed an entry.
+
+    attributes:
+        count: number of elements in the hash table
+        table: used to represent our internal array
+        hashes: the full hash of the entry in each slot of table
+        table_size: current size of the hash table
+        max_load_factor: fraction of table_size that can be used before growing
+        displacement_max: largest distance from its home position at which an entry was placed
+    """
+
+    def __init__(self, max_potions: int, good_hash: bool = True, tablesize_override: int = -1,
+                 max_load_factor: float = 0.5) -> None:
+        if not 0 < max_load_factor <= 1:
+            raise ValueError("Load factor must be in (0, 1]")
+
+        # Statistic setting
+        self.conflict_count = 0
+        self.probe_max = 0
+        self.probe_total = 0
+        self.displacement_max = 0
+
+        self.count = 0
+        self.table = None
+        self.hashes = None
+        self.table_size = 0
+        self.max_load_factor = max_load_factor
+        self.useHash = good_hash
+
+        if tablesize_override != -1:
+            self.initalise_with_tablesize(tablesize_override)
+        else:
+            self.initalise_with_tablesize(max_potions * 2)
+
+    def hash(self, potion_name: str) -> int:
+        """
+        Hashes the potions name into its full hash, see LinearProbePotionTable.hash
+        :complexity: O(K) where K is the length of the name for good hash, O(1) for bad hash
+        """
+        if self.useHash:
+            return mix_hash(Potion.good_hash(potion_name, HASH_MODULUS))
+        else:
+            return Potion.bad_hash(potion_name, HASH_MODULUS)
+
+    def statistics(self) -> tuple:
+        """
+        Creates a tuple with the conflict_count, probe_total and probe_max
+        :complexity: O(1)
+        """
+        return (self.conflict_count, self.probe_total, self.probe_max,)
+
+    def __len__(self) -> int:
+        """
+        Returns number of elements in the hash table
+        :complexity: O(1)
+        """
+        return self.count
+
+    def __record_probe(self, steps: int, reached_end: bool) -> None:
+        """
+        Adds a probe that stepped over the given number of slots to the statistics, see
+        LinearProbePotionTable. A probe that went on until the key could not be further on,
+        an insertion or a failed lookup, counts as a conflict if it took any step, and for probe_max.
+        :complexity: O(1)
+        """
+        self.probe_total += steps
+        if reached_end:
+            if steps > 0:
+                self.conflict_count += 1
+            if self.probe_max < steps:
+                self.probe_max = steps
+
+    def __distance(self, position: int) -> int:
+        """
+        Returns how far the entry at position is from its home position.
+        :pre: there is an entry at position
+        :complexity: O(1)
+        """
+        return (position - self.hashes[position] % self.table_size) % self.table_size
+
+    def __find(self, key: str, key_hash: int, record: bool = True) -> int:
+        """
+        Find the position of key, stopping at an empty slot or at an entry closer
+        to its home position than key would be.
+        :param record: count the probe in the statistics
+        :complexity best: O(K) the key is at its home position, where K is the size of the key
+        :complexity worst: O(K + D) where D is the largest distance of an entry from its home position
+        :raises KeyError: when the key is not in the table
+        """
+        position = key_hash % self.table_size
+        for distance in range(self.table_size):
+            if self.table[position] is None or self.__distance(position) < distance:
+                if record:
+                    self.__record_probe(distance, True)
+                raise KeyError(key)
+            if self.hashes[position] == key_hash and self.table[position][0] == key:
+                if record:
+                    self.__record_probe(distance, False)
+                return position
+            position = (position + 1) % self.table_size
+        if record:
+            self.__record_probe(self.table_size, False)
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Checks to see if the given key is in the Hash Table
+        :see: #self.__getitem__(self, key: str)
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: str) -> T:
+        """
+        Get the item at a certain key
+        :see: #self.__find(key: str, key_hash: int)
+        :raises KeyError: when the item doesn't exist
+        """
+        return self.table[self.__find(key, self.hash(key))][1]
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+        Set an (key, data) pair in our hash table, growing it first if a new key would
+        take it past max_load_factor.
+        The new entry probes from its home position, updating the entry with the same
+        key if it meets one. It takes the first empty slot, or the slot of the first
+        entry closer to its home position, in which case that entry is carried on and
+        placed the same way.
+        :complexity best: O(K) where K is the size of the key
+        :complexity worst: O(K + N) where N is the table_size, amortised over growing the table
+        :raises KeyError: when the table is full
+        """
+        key_hash = self.hash(key)
+        try:
+            position = self.__find(key, key_hash, False)
+        except KeyError:
+            pass
+        else:
+            self.__record_probe(self.__distance(position), False)
+            self.table[position] = (key, data)
+            return
+
+        if self.count + 1 > self.max_load_factor * self.table_size:
+            self.__rehash(next_prime(2 * self.table_size))
+        if self.is_full():
+            raise KeyError(key)
+
+        self.__record_probe(self.__place((key, data), key_hash), True)
+        self.count += 1
+
+    def __place(self, entry: tuple, key_hash: int) -> int:
+        """
+        Places an entry whose key is not in the table, displacing entries closer to
+        their home position on the way.
+        :pre: the table is not full
+        :complexity: O(N) worst, where N is the table_size
+        :returns: the number of slots stepped over
+        """
+        position = key_hash % self.table_size
+        distance = 0
+        probes = 0
+        while self.table[position] is not None:
+            resident_distance = self.__distance(position)
+            if resident_distance < distance:  # the resident is better off, it moves on instead
+                self.displacement_max = max(self.displacement_max, distance)
+                self.table[position], entry = entry, self.table[position]
+                self.hashes[position], key_hash = key_hash, self.hashes[position]
+                distance = resident_distance
+            position = (position + 1) % self.table_size
+            distance += 1
+            probes += 1
+        self.displacement_max = max(self.displacement_max, distance)
+        self.table[position] = entry
+        self.hashes[position] = key_hash
+        return probes
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Delete the (key, data) pair with the given key, then shift the entries after it
+        back by one slot until reaching an empty slot or an entry at its home position.
+        :complexity: O(K + D) where K is the size of the key and D the length of the run shifted
+        :raises KeyError: when the key doesn't exist
+        """
+        position = self.__find(key, self.hash(key))
+        following = (position + 1) % self.table_size
+        while self.table[following] is not None and self.__distance(following) > 0:
+            self.table[position] = self.table[following]
+            self.hashes[position] = self.hashes[following]
+            position = following
+            following = (following + 1) % self.table_size
+        self.table[position] = None
+        self.hashes[position] = None
+        self.count -= 1
+
+    def __rehash(self, tablesize: int) -> None:
+        """
+        Move every entry into a new table of the given size, placed by its stored hash.
+        Moving entries is not counted in the statistics, nor in displacement_max.
+        :complexity: O(N + M) where N is the current and M the new table_size
+        """
+        old_table = self.table
+        old_hashes = self.hashes
+        self.table_size = tablesize
+        self.table = ArrayR(tablesize)
+        self.hashes = ArrayR(tablesize)
+        displacement_max = self.displacement_max
+        for index in range(len(old_table)):
+            if old_table[index] is not None:
+                self.__place(old_table[index], old_hashes[index])
+        self.displacement_max = displacement_max
+
+    def initalise_with_tablesize(self, tablesize: int) -> None:
+        """
+        Initialise a new array, with table size given by tablesize.
+        Complexity: O(n), where n is len(tablesize)
+        """
+        self.count = 0
+        self.table_size = tablesize
+        self.table = ArrayR(tablesize)
+        self.hashes = ArrayR(tablesize)
+
+    def is_empty(self):
+        """
+        Returns whether the hash table is empty
+        :complexity: O(1)
+        """
+        return self.count == 0
+
+    def is_full(self):
+        """
+        Returns whether the hash table is full
+        :complexity: O(1)
+        """
+        return self.count == len(self.table)
+
+    def insert(self, key: str, data: T) -> None:
+        """
+        Utility method to call our setitem method
+        :see: #__setitem__(self, key: str, data: T)
+        """
+        self[key] = data
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular order)
+        :complexity: O(N) where N is the table size
+        """
+        result = ""
+        for item in self.table:
+            if item is not None:
+                (key, value) = item
+                result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
@@ -0,0 +1,71 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from array_avl import ArrayAVLTree
+
+class TestArrayAVL(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.b = ArrayAVLTree()
+        self.b[15] = "A"
+        self.b[10] = "B"
+        self.b[20] = "C"
+        self.b[17] = "D"
+        self.b[5] = "E"
+        self.b[3] = "F"
+        self.b[4] = "G"
+        self.b[22] = "H"
+        return super().setUp()
+
+    def test_run_through(self):
+        # Same shape as the linked AVL tree, see test_avl
+        b = self.b
+        self.assertEqual(b.items[b.root], "A")
+        self.assertEqual(b.items[b.left[b.left[b.root]]], "F")
+        self.assertEqual(b.items[b.left[b.right[b.root]]], "D")
+        self.assertEqual(list(b), [3, 4, 5, 10, 15, 17, 20, 22])
+        self.assertEqual(b[17], "D")
+        # Bad and duplicate keys are reported as avl.AVLTree reports them, and skipped
+        output = io.StringIO()
+        with redirect_stdout(output):
+            b[17] = "X"
+            b["x"] = "X"
+        self.assertIn("Inserting duplicate item", output.getvalue())
+        self.assertIn("Key must be a real number", output.getvalue())
+        self.assertEqual((b[17], len(b)), ("D", 8))
+
+        del b[20]
+        del b[17]
+        self.assertEqual(b.items[b.root], "E")
+        self.assertEqual(b.items[b.left[b.right[b.root]]], "B")
+        self.assertEqual(len(b), 6)
+        self.assertFalse(17 in b)
+        self.assertRaises(ValueError, b.__delitem__, 17)
+
+        # Deleted slots are reused before the arrays grow
+        used = b.used
+        b[16] = "I"
+        b[18] = "J"
+        self.assertEqual(b.used, used)
+
+    def test_kth(self):
+        self.assertEqual([self.b.kth_largest(x).key for x in range(1, 9)], [22, 20, 17, 15, 10, 5, 4, 3])
+        self.assertIsNone(self.b.kth_largest(9))
+        self.assertEqual(self.b.rank(17), 6)
+
+    def test_growth_and_copy(self):
+        b = ArrayAVLTree(1)
+        for key in range(100):
+            b[key] = key * 2
+        snapshot = b.copy()
+        for key in range(50):
+            del b[key]
+        self.assertEqual(list(b), list(range(50, 100)))
+        self.assertEqual(list(snapshot), list(range(100)))
+        self.assertEqual(snapshot[10], 20)
+        self.assertEqual(b.height[b.root], 6)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestArrayAVL)
+    unittest.TextTestRunner(verbosity=0).run(suite)
@@ -1,4 +1,7 @@
+import io
+import random
 import unittest
+from contextlib import redirect_stdout
 
 from avl import AVLTree
 
@@ -59,6 +62,157 @@ class TestAVL(unittest.TestCase):
         self.b[4] = "G"
         self.b[22] = "H"
         self.assertEqual([self.b.kth_largest(x).key for x in range(1, 9)], [22, 20, 17, 15, 10, 5, 4, 3])
+        self.assertIsNone(self.b.kth_largest(9))
+
+    def test_order_statistics(self):
+        self.b = AVLTree()
+        keys = [15, 10, 20, 17, 5, 3, 4, 22]
+        for key in keys:
+            self.b[key] = str(key)
+        self.assertEqual(self.b.root.size, 8)
+        self.assertEqual([self.b.select(r).key for r in range(1, 9)], sorted(keys))
+        self.assertEqual([self.b.rank(key) for key in sorted(keys)], list(range(1, 9)))
+        self.assertRaises(IndexError, self.b.select, 0)
+        self.assertRaises(KeyError, self.b.rank, 16)
+
+        # Sizes are kept up to date through deletions and rotations
+        del self.b[20]
+        del self.b[17]
+        del self.b[3]
+        self.assertEqual(self.b.root.size, 5)
+        self.assertEqual([self.b.select(r).key for r in range(1, 6)], [4, 5, 10, 15, 22])
+        self.assertEqual(self.b.rank(22), 5)
+
+    def test_bulk_load(self):
+        pairs = [(key, str(key)) for key in range(10)]
+        self.b = AVLTree.from_sorted(pairs)
+        self.assertEqual(len(self.b), 10)
+        self.assertEqual(list(self.b), list(range(10)))
+        self.assertEqual(self.b.root.key, 5)
+        self.assertEqual(self.b.root.height, 4)
+        self.assertEqual(self.b.root.left.size, 5)
+        self.assertEqual(self.b[7], "7")
+        with self.assertRaises(ValueError):
+            AVLTree.from_sorted([(1, "A"), (1, "B")])
+
+        self.b.bulk_insert([(key, "new") for key in range(20, 5, -1)])
+        self.assertEqual(list(self.b), list(range(21)))
+        self.assertEqual(self.b[7], "7")  # duplicates are skipped, the tree keeps its item
+        self.assertEqual(self.b[12], "new")
+        self.assertEqual(self.b.kth_largest(3).key, 18)
+
+        # Bad and duplicate keys are reported the same way by bulk_insert and __setitem__
+        single = io.StringIO()
+        with redirect_stdout(single):
+            self.b["x"] = "bad"
+            self.b[3] = "duplicate"
+        batch = io.StringIO()
+        with redirect_stdout(batch):
+            self.b.bulk_insert([("x", "bad"), (3, "duplicate"), (30, "new")])
+        self.assertEqual(batch.getvalue(), single.getvalue())
+        self.assertIn("Key must be a real number", batch.getvalue())
+        self.assertEqual(len(self.b), 22)
+
+    def test_join_split_union(self):
+        self.b = AVLTree.from_sorted([(key, "A") for key in range(0, 40, 2)])
+        other = AVLTree.from_sorted([(key, "B") for key in range(0, 40, 3)])
+        self.b.union(other)
+        self.assertEqual(list(self.b), sorted(set(range(0, 40, 2)) | set(range(0, 40, 3))))
+        self.assertEqual(len(self.b), self.b.root.size)
+        self.assertEqual(self.b[6], "A")  # keys already in the tree keep their item
+        self.assertEqual(self.b[9], "B")
+        self.assertTrue(other.is_empty())
+
+        smaller, larger = self.b.split(15)
+        self.assertEqual(list(smaller), [0, 2, 3, 4, 6, 8, 9, 10, 12, 14])
+        self.assertEqual(larger.select(1).key, 15)
+        self.assertTrue(self.b.is_empty())
+
+        joined = AVLTree.join(smaller, 14.5, "C", larger)
+        self.assertEqual(joined.rank(14.5), 11)
+        self.assertEqual(len(joined), joined.root.size)
+        self.assertLessEqual(joined.root.height, 6)  # at most 6 levels for 28 nodes in an AVL tree
+        with self.assertRaises(ValueError):
+            AVLTree.join(joined, 0, "D", AVLTree())
+
+    def test_multimap(self):
+        self.b = AVLTree(multimap=True)
+        for key, item in [(5, "A"), (3, "B"), (5, "C"), (8, "D"), (5, "E"), (3, "F")]:
+            self.b[key] = item
+        self.assertEqual(len(self.b), 6)
+        self.assertEqual(list(self.b), [3, 3, 5, 5, 5, 8])
+        self.assertEqual(self.b.get_all(5), ["A", "C", "E"])  # insertion order
+        self.assertEqual(self.b[5], "A")
+        self.assertEqual(self.b.rank(5), 3)
+        self.assertEqual(self.b.kth_largest(2).item, "E")
+
+        del self.b[5]  # the first one inserted goes
+        self.assertEqual(self.b.get_all(5), ["C", "E"])
+        self.assertEqual(self.b.root.size, 5)
+
+        self.b.bulk_insert([(5, "G"), (1, "H"), (3, "I")])
+        self.assertEqual(self.b.get_all(3), ["B", "F", "I"])
+        self.assertEqual(self.b.get_all(5), ["C", "E", "G"])
+        self.assertEqual([item for _, item in self.b.reverse_iter()], ["D", "G", "E", "C", "I", "F", "B", "H"])
+
+    def test_delete_rank(self):
+        self.b = AVLTree(multimap=True)
+        for key, item in [(5, "A"), (3, "B"), (5, "C"), (8, "D"), (5, "E"), (1, "F")]:
+            self.b[key] = item
+        # the middle of the three items with key 5
+        self.assertEqual(self.b.delete_rank(self.b.rank(5) + 1), "C")
+        self.assertEqual(self.b.get_all(5), ["A", "E"])
+        self.assertEqual(self.b.delete_rank(1), "F")
+        self.assertEqual(list(self.b.items()), [(3, "B"), (5, "A"), (5, "E"), (8, "D")])
+        self.b.validate()
+        self.assertRaises(IndexError, self.b.delete_rank, 5)
+        for _ in range(4):
+            self.b.delete_rank(1)
+        self.assertTrue(self.b.is_empty())
+
+    def test_validate(self):
+        self.b = AVLTree.from_sorted([(key, None) for key in range(7)])
+        self.b.validate()
+        self.b.root.left.height = 3
+        self.assertRaises(ValueError, self.b.validate)
+        self.b.root.left.height = 2
+        self.b.root.right.right.key = 4
+        self.assertRaises(ValueError, self.b.validate)
+
+    def test_random_operations(self):
+        # 100000 mixed operations checked against a count of each key, validating the tree as it changes
+        rand = random.Random(0)
+        for multimap in (False, True):
+            self.b = AVLTree(multimap)
+            counts = {}
+            for i in range(50000):
+                op = rand.random()
+                key = rand.randrange(2000)
+                if op < 0.5:
+                    if multimap or key not in counts:
+                        counts[key] = counts.get(key, 0) + 1
+                        self.b[key] = i
+                elif op < 0.9:
+                    if key in counts:
+                        counts[key] -= 1
+                        if counts[key] == 0:
+                            del counts[key]
+                        del self.b[key]
+                    else:
+                        self.assertRaises(ValueError, self.b.__delitem__, key)
+                elif op < 0.95:
+                    batch = [(k, i) for k in rand.sample(range(2000), rand.randrange(50))]
+                    batch = [(k, item) for k, item in batch if multimap or k not in counts]
+                    for k, _ in batch:
+                        counts[k] = counts.get(k, 0) + 1
+                    self.b.bulk_insert(batch)
+                else:
+                    self.assertEqual(key in self.b, key in counts)
+                if i % 1000 == 0:
+                    self.b.validate()
+                    self.assertEqual(len(self.b), sum(counts.values()))
+            self.b.validate()
+            self.assertEqual(list(self.b), sorted(key for key in counts for _ in range(counts[key])))
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestAVL)
@@ -39,6 +39,35 @@ class TestBST(unittest.TestCase):
         self.assertEqual(self.b.get_successor(self.b.get_tree_node_by_key(15)).item, "D")
         self.assertEqual(self.b.get_successor(self.b.get_tree_node_by_key(5)), None)
 
+    def test_range_queries(self):
+        self.assertEqual(list(self.b.range_iter(4, 17)), [(4, "G"), (5, "E"), (10, "B"), (15, "A"), (17, "D")])
+        self.assertEqual([key for key, _ in self.b.range_iter(11, 14)], [])
+        self.assertEqual([key for key, _ in self.b.reverse_iter()], [22, 20, 17, 15, 10, 5, 4, 3])
+        self.assertEqual(self.b.floor(16).key, 15)
+        self.assertEqual(self.b.floor(17).key, 17)
+        self.assertIsNone(self.b.floor(2))
+        self.assertEqual(self.b.ceiling(11).key, 15)
+        self.assertIsNone(self.b.ceiling(23))
+
+    def test_items(self):
+        self.assertEqual(list(self.b), [3, 4, 5, 10, 15, 17, 20, 22])
+        self.assertEqual(list(self.b.items())[:3], [(3, "F"), (4, "G"), (5, "E")])
+        self.assertEqual("".join(self.b.values()), "FGEBADCH")
+        self.assertEqual(list(BinarySearchTree().items()), [])
+
+    def test_deep_tree(self):
+        # Sorted keys give a degenerate tree deeper than the recursion limit
+        b = BinarySearchTree()
+        for key in range(2000):
+            b[key] = str(key)
+        self.assertEqual(b[1999], "1999")
+        self.assertTrue(1500 in b)
+        del b[1999]
+        del b[0]
+        self.assertEqual(len(b), 1998)
+        self.assertFalse(1999 in b)
+        self.assertEqual(b.root.key, 1)
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestBST)
     unittest.TextTestRunner(verbosity=0).run(suite)
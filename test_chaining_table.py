@@ -0,0 +1,53 @@
+import unittest
+
+from chaining_table import ChainingPotionTable
+
+class TestChainingTable(unittest.TestCase):
+
+    def test_stats(self):
+        lookup = {
+            "s1": 5,
+            "s2": 5,
+            "s3": 5,
+            "s4": 7,
+        }
+        h = lambda self, k: lookup[k]
+        saved = ChainingPotionTable.hash
+        ChainingPotionTable.hash = h
+        try:
+            l = ChainingPotionTable(10, True, 10)
+            l["s1"] = "s1"
+            l["s2"] = "s2"
+            l["s3"] = "s3"
+            l["s4"] = "s4"
+            # s2 and s3 are appended to the bucket of s1, past one and two entries
+            self.assertEqual(l.table[5], [5, "s1", "s1", 5, "s2", "s2", 5, "s3", "s3"])
+            self.assertEqual(l.statistics(), (2, 3, 2))
+
+            l["s2"] = "updated"
+            del l["s1"]
+            self.assertEqual(len(l), 3)
+            self.assertEqual(l["s2"], "updated")
+            self.assertFalse("s1" in l)
+            # Updating s2 stepped past s1, and the failed lookup of s1 past s2 and s3
+            self.assertEqual(l.statistics(), (3, 6, 2))
+            self.assertRaises(KeyError, l.__delitem__, "s1")
+            del l["s4"]
+            self.assertIsNone(l.table[7])
+        finally:
+            ChainingPotionTable.hash = saved
+
+    def test_growth(self):
+        l = ChainingPotionTable(2, True, 5, 2)
+        names = ["Potion of " + str(x) for x in range(40)]
+        for i, name in enumerate(names):
+            l[name] = i
+            self.assertEqual(len(l), i + 1)
+        self.assertTrue(all(l[name] == i for i, name in enumerate(names)))
+        self.assertFalse("Potion of 40" in l)
+        # Grown while keeping at most 2 entries per bucket on average
+        self.assertGreaterEqual(l.table_size, 20)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestChainingTable)
+    unittest.TextTestRunner(verbosity=0).run(suite)
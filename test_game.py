@@ -24,6 +24,12 @@ class TestGame(unittest.TestCase):
         # Vendor Selection gives unique results
         self.assertTrue(len(set(res)) == len(set(res2)) == 99)
 
+        # The rejection-free shuffle also gives unique results, even with every potion taken
+        res3 = g.choose_potions_for_vendors(99, compatible=False)
+        self.assertEqual(len(set(res3)), 99)
+        self.assertEqual(set(res3), set(res))
+        self.assertRaises(ValueError, g.choose_potions_for_vendors, 100)
+
     def test_example(self):
         G = Game()
         # There are these potions, with these stats, available over the course of the game.
@@ -57,6 +63,74 @@ class TestGame(unittest.TestCase):
         # Play the game with 3 attempts, at different starting money.
         results = G.solve_game(full_vendor_info, [12.5, 45, 80])
         self.assertEqual(results, [37.5, 90, 142.5])
+        self.assertEqual(G.solve_game(full_vendor_info, [12.5, 45, 80], batch=True), [37.5, 90, 142.5])
+
+        # The trade log is opt-in and structured
+        trades = []
+        self.assertEqual(G.solve_game(full_vendor_info, [12.5], on_transaction=trades.append), [37.5])
+        self.assertEqual(trades, [
+            (0, "Potion of Instant Health", 2.5, 5, 15, 0),
+        ])
+
+    def test_duplicate_ratios(self):
+        G = Game()
+        G.set_total_potion_data([
+            ["A", "Health", 10],
+            ["B", "Buff", 20],
+            ["C", "Damage", 5],
+            ["D", "Buff", 4],
+        ])
+        G.add_potions_to_inventory([("A", 2), ("B", 1), ("C", 4), ("D", 1)])
+        # A, B and C all share a profit ratio of 1, D is the best buy with a ratio of 2
+        results = G.solve_game([("A", 20), ("B", 40), ("C", 10), ("D", 12)], [34, 34, 0, 200])
+        self.assertEqual(results, [72, 72, 0, 132])
+        # Batch mode answers the same days from cumulative costs
+        results = G.solve_game([("A", 20), ("B", 40), ("C", 10), ("D", 12)], [34, 34, 0, 200], batch=True)
+        self.assertEqual(results, [72, 72, 0, 132])
+
+    def test_shared_buy_price(self):
+        G = Game()
+        G.set_total_potion_data([
+            ["A", "Health", 10],
+            ["B", "Buff", 10],
+            ["C", "Damage", 5],
+        ])
+        G.add_potions_to_inventory([("A", 2), ("B", 1), ("C", 4)])
+        # A and B share a buy price, and both stay in the inventory
+        self.assertEqual(len(G.inventory), 3)
+        self.assertEqual([potion.name for potion, _ in G.inventory.get_all(10)], ["A", "B"])
+        res = G.choose_potions_for_vendors(3, compatible=False)
+        self.assertEqual(sorted(res), [("A", 2), ("B", 1), ("C", 4)])
+
+    def test_restock(self):
+        G = Game()
+        G.set_total_potion_data([
+            ["A", "Health", 10],
+            ["B", "Buff", 10],
+            ["C", "Damage", 5],
+        ])
+        G.add_potions_to_inventory([("A", 2), ("B", 3)])
+        G.add_potions_to_inventory([("A", 5), ("C", 1), ("C", 4)])
+        # Restocking replaces a potion's entry, and the last amount named wins
+        self.assertEqual(len(G.inventory), 3)
+        self.assertEqual(sorted((potion.name, amount) for _, (potion, amount) in G.inventory.items()),
+                         [("A", 5), ("B", 3), ("C", 4)])
+        G.inventory.validate()
+        # so every vendor gets a different potion
+        for compatible in (True, False):
+            res = G.choose_potions_for_vendors(3, compatible)
+            self.assertEqual(sorted(res), [("A", 5), ("B", 3), ("C", 4)])
+        self.assertRaises(ValueError, G.choose_potions_for_vendors, 4)
+
+        # A batch naming an unknown potion changes nothing
+        self.assertRaises(KeyError, G.add_potions_to_inventory, [("A", 7), ("Z", 1)])
+        self.assertEqual(sorted((potion.name, amount) for _, (potion, amount) in G.inventory.items()),
+                         [("A", 5), ("B", 3), ("C", 4)])
+        # Restocking a potion sharing its price with another leaves the other one alone
+        G.add_potions_to_inventory([("B", 6)])
+        self.assertEqual([(potion.name, amount) for potion, amount in G.inventory.get_all(10)],
+                         [("A", 5), ("B", 6)])
+        G.inventory.validate()
 
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestGame)
@@ -1,6 +1,6 @@
 import unittest
 
-from hash_table import LinearProbePotionTable
+from hash_table import LinearProbePotionTable, LINEAR, QUADRATIC, DOUBLE, NO_STATS, DETAILED
 
 class TestTable(unittest.TestCase):
     
@@ -34,6 +34,188 @@ class TestTable(unittest.TestCase):
         
         self.assertEqual(l.statistics(), (3, 4, 2))
 
+    def test_delete(self):
+        lookup = {
+            "s1": 5,
+            "s2": 5,
+            "s3": 5,
+            "s4": 7,
+            "s5": 5,
+        }
+        h = lambda self, k: lookup[k]
+        saved = LinearProbePotionTable.hash
+        LinearProbePotionTable.hash = h
+        try:
+            l = LinearProbePotionTable(10, True, 10)
+            l["s1"] = "s1"
+            l["s2"] = "s2"
+            l["s3"] = "s3"
+            l["s4"] = "s4"
+            del l["s2"]
+            # s3 is still found past the tombstone left by s2
+            self.assertEqual(len(l), 3)
+            self.assertEqual(l["s3"], "s3")
+            self.assertFalse("s2" in l)
+            self.assertRaises(KeyError, l.__delitem__, "s2")
+            self.assertEqual(l.cluster_statistics(), (1, 1, 4))
+            # The tombstone is reused by the next insertion along the chain
+            l["s5"] = "s5"
+            self.assertEqual(l.table[6], ("s5", "s5"))
+            self.assertEqual(l.cluster_statistics(), (0, 1, 4))
+        finally:
+            LinearProbePotionTable.hash = saved
+
+    def test_stored_hashes(self):
+        # Full hashes that differ but share a position in a table of size 10
+        lookup = {
+            "s1": 5,
+            "s2": 15,
+            "s3": 25,
+        }
+        h = lambda self, k: lookup[k]
+        saved = LinearProbePotionTable.hash
+        LinearProbePotionTable.hash = h
+        try:
+            l = LinearProbePotionTable(10, True, 10)
+            l["s1"] = "s1"
+            l["s2"] = "s2"
+            l["s3"] = "s3"
+            self.assertEqual([l.hashes[i] for i in range(5, 8)], [5, 15, 25])
+            self.assertEqual(l.statistics(), (2, 3, 2))
+            # Growing moves the entries by their stored hashes, into a table of size 23
+            for i in range(5):
+                lookup["t" + str(i)] = 100 + i
+                l["t" + str(i)] = i
+            self.assertIsNone(l.old_table)
+            self.assertEqual(l.table_size, 23)
+            self.assertEqual((l.table[15], l.hashes[15]), (("s2", "s2"), 15))
+            self.assertEqual(l["s3"], "s3")
+        finally:
+            LinearProbePotionTable.hash = saved
+
+    def test_probing(self):
+        lookup = {
+            "s1": 5,
+            "s2": 5 + 11 * 2,
+            "s3": 5 + 11 * 4,
+            "s4": 5,
+        }
+        h = lambda self, k: lookup[k]
+        saved = LinearProbePotionTable.hash
+        LinearProbePotionTable.hash = h
+        try:
+            # Sizes are rounded up to a prime, 11, and every key starts at position 5
+            for probing, positions in ((QUADRATIC, [5, 6, 9, 3]), (DOUBLE, [5, 8, 10, 6])):
+                l = LinearProbePotionTable(10, True, 10, 0.5, probing)
+                self.assertEqual(l.table_size, 11)
+                for key in ["s1", "s2", "s3", "s4"]:
+                    l[key] = key
+                self.assertEqual([l.table[p][0] for p in positions], ["s1", "s2", "s3", "s4"])
+                self.assertEqual(l["s4"], "s4")
+            # s2 steps by 3, s3 by 5 and s4 by 1, one probe each, and looking up s4 probes once more
+            self.assertEqual(l.statistics(), (3, 4, 1))
+            self.assertRaises(ValueError, LinearProbePotionTable, 10, True, 10, 0.75, QUADRATIC)
+        finally:
+            LinearProbePotionTable.hash = saved
+
+    def test_double_hashing_bad_hash(self):
+        # The double hashing step comes from the full hash, which for the bad hash is only
+        # the first character, so the step is always 1 and the table probes linearly
+        names = ["Potion of " + str(x) for x in range(20)]
+        linear = LinearProbePotionTable(20, False, 101, 0.5, LINEAR)
+        double = LinearProbePotionTable(20, False, 101, 0.5, DOUBLE)
+        for name in names:
+            linear[name] = name
+            double[name] = name
+        self.assertEqual([double.table[i] for i in range(101)], [linear.table[i] for i in range(101)])
+        self.assertEqual(double.statistics(), linear.statistics())
+
+        # With the good hash the steps differ from key to key
+        good = LinearProbePotionTable(20, True, 101, 0.5, DOUBLE)
+        self.assertGreater(len({(good.hash(name) // 101) % 100 for name in names}), 1)
+
+    def test_statistics_levels(self):
+        lookup = {
+            "s1": 5,
+            "s2": 5,
+            "s3": 5,
+            "s4": 7
+        }
+        h = lambda self, k: lookup[k]
+        saved = LinearProbePotionTable.hash
+        LinearProbePotionTable.hash = h
+        try:
+            quiet = LinearProbePotionTable(10, True, 10, stats=NO_STATS)
+            detailed = LinearProbePotionTable(10, True, 10, stats=DETAILED)
+            for l in (quiet, detailed):
+                for key in ["s1", "s2", "s3", "s4"]:
+                    l[key] = key
+                self.assertEqual(l["s3"], "s3")
+            self.assertEqual(quiet.statistics(), (0, 0, 0))
+            # the same counters as test_stats, plus the lookup of s3 after two steps
+            self.assertEqual(detailed.statistics(), (3, 6, 2))
+            details = detailed.detailed_statistics()
+            # s1 took no step, s2 and s4 one, s3 two, and so did the lookup of s3
+            self.assertEqual(details['probe_lengths'], {0: 1, 1: 2, 2: 2})
+            self.assertEqual(details['timings']['set'][0], 4)
+            self.assertEqual(details['timings']['get'][0], 1)
+            self.assertEqual(details['clusters'], {4: 1})
+        finally:
+            LinearProbePotionTable.hash = saved
+
+    def test_growth(self):
+        l = LinearProbePotionTable(2, True, 5)
+        names = ["Potion of " + str(x) for x in range(40)]
+        for i, name in enumerate(names):
+            l[name] = i
+            # Everything stays reachable while entries are moved into the bigger table
+            self.assertEqual(len(l), i + 1)
+            self.assertEqual(l[names[i // 2]], i // 2)
+        l[names[0]] = "updated"
+        self.assertEqual(len(l), 40)
+        self.assertEqual(l[names[0]], "updated")
+        self.assertTrue(all(name in l for name in names))
+        self.assertFalse("Potion of 40" in l)
+        # Grown to a prime size, never past the load factor
+        self.assertGreaterEqual(l.table_size, 80)
+        self.assertTrue(all(l.table_size % d != 0 for d in range(2, l.table_size)))
+
+    def test_update_does_not_grow(self):
+        l = LinearProbePotionTable(5, True, 10)
+        for i in range(5):
+            l["k" + str(i)] = i
+        # The table is at its load factor, but updating a key takes no more room
+        l["k0"] = "updated"
+        self.assertEqual(l.table_size, 10)
+        self.assertEqual(len(l), 5)
+        self.assertEqual(l["k0"], "updated")
+        # A new key still grows it
+        l["k5"] = 5
+        self.assertGreater(l.table_size, 10)
+        self.assertEqual(len(l), 6)
+
+        # A full table can still update its keys
+        full = LinearProbePotionTable(3, True, 3, 1)
+        for i in range(3):
+            full["k" + str(i)] = i
+        full["k1"] = "updated"
+        self.assertEqual((full.table_size, len(full), full["k1"]), (3, 3, "updated"))
+
+    def test_bulk_insert(self):
+        l = LinearProbePotionTable(2, True, 5)
+        names = ["Potion of " + str(x) for x in range(40)]
+        l["Potion of 0"] = "before"
+        l.bulk_insert([(name, i) for i, name in enumerate(names)] + [(names[1], "updated")])
+        # Sized once to a prime holding every entry, with nothing left to move
+        self.assertEqual(len(l), 40)
+        self.assertGreaterEqual(l.table_size, 80)
+        self.assertTrue(all(l.table_size % d != 0 for d in range(2, l.table_size)))
+        self.assertIsNone(l.old_table)
+
+        self.assertEqual(l.get_many([names[2], names[0], names[1]]), [2, 0, "updated"])
+        self.assertEqual(l.get_many([]), [])
+        self.assertRaises(KeyError, l.get_many, [names[3], "Potion of 40"])
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestTable)
     unittest.TextTestRunner(verbosity=0).run(suite)
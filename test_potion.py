@@ -16,6 +16,18 @@ class TestPotion(unittest.TestCase):
         self.assertEqual(p2.buy_price, 20)
         self.assertEqual(p2.quantity, 0)
 
+    def test_good_hash(self):
+        # Polynomial hash of the characters with the prime base 52457
+        self.assertEqual(Potion.HASH_BASE, 52457)
+        self.assertEqual(Potion.good_hash("ab", 1000), (97 * 52457 + 98) % 1000)
+        self.assertEqual(Potion.good_hash("Potion of Extreme Speed", 1), 0)
+        # Reducing every few characters gives the same value as reducing at every one
+        name = "Potion of " + "Extreme Speed " * 20
+        value = 0
+        for char in name:
+            value = (ord(char) + 52457 * value) % 1009
+        self.assertEqual(Potion.good_hash(name, 1009), value)
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestPotion)
     unittest.TextTestRunner(verbosity=0).run(suite)
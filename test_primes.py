@@ -1,6 +1,6 @@
 import unittest
 
-from primes import largest_prime
+from primes import largest_prime, next_prime, is_prime
 
 class TestPrimes(unittest.TestCase):
     
@@ -10,6 +10,19 @@ class TestPrimes(unittest.TestCase):
         for i, o in zip(inputs, outputs):
             self.assertEqual(largest_prime(i), o)
 
+    def test_next_prime(self):
+        inputs = [-4, 2, 19, 20, 7906]
+        outputs = [2, 3, 23, 23, 7907]
+        for i, o in zip(inputs, outputs):
+            self.assertEqual(next_prime(i), o)
+
+    def test_is_prime(self):
+        self.assertEqual([n for n in range(-2, 30) if is_prime(n)], [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        # Queries past the end of the cached sieve extend it
+        self.assertTrue(is_prime(104729))
+        self.assertFalse(is_prime(104729 * 3))
+        self.assertEqual(largest_prime(104729), 104723)
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestPrimes)
     unittest.TextTestRunner(verbosity=0).run(suite)
@@ -11,6 +11,31 @@ class TestRandom(unittest.TestCase):
         r = RandomGen(seed=25)
         self.assertEqual(r.randint(100), 69)
 
+    def test_sequence(self):
+        # Outputs of the original string based majority vote
+        r = RandomGen(seed=7)
+        self.assertEqual([r.randint(1000) for _ in range(10)], [206, 101, 842, 793, 441, 57, 178, 157, 503, 104])
+        self.assertEqual([r.randint(65536) for _ in range(3)], [160, 5980, 62739])
+        self.assertEqual(r.randint(0), 0)
+
+    def test_randints(self):
+        r1 = RandomGen(seed=7)
+        r2 = RandomGen(seed=7)
+        for k, n in [(1000, 10), (100, 2500), (70000, 7), (5, 0), (0, 3)]:
+            self.assertEqual(list(r1.randints(k, n)), [r2.randint(k) for _ in range(n)])
+        self.assertEqual(r1.state, r2.state)
+        self.assertEqual(r1.randints(1000, 1).typecode, 'H')
+
+    def test_jump(self):
+        r1 = RandomGen(seed=25)
+        r2 = RandomGen(seed=25)
+        for _ in range(1234):
+            r1.randint(100)
+        # every randint draws five numbers
+        r2.jump(5 * 1234)
+        self.assertEqual(r1.state, r2.state)
+        self.assertEqual(r1.randint(100), r2.randint(100))
+
 if __name__ == '__main__':
     suite = unittest.TestLoader().loadTestsFromTestCase(TestRandom)
     unittest.TextTestRunner(verbosity=0).run(suite)
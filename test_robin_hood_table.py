@@ -0,0 +1,57 @@
+import unittest
+
+from robin_hood_table import RobinHoodPotionTable
+
+class TestRobinHoodTable(unittest.TestCase):
+
+    def test_stats(self):
+        lookup = {
+            "s1": 5,
+            "s2": 5,
+            "s3": 6,
+            "s4": 5,
+        }
+        h = lambda self, k: lookup[k]
+        saved = RobinHoodPotionTable.hash
+        RobinHoodPotionTable.hash = h
+        try:
+            l = RobinHoodPotionTable(10, True, 10)
+            l["s1"] = "s1"
+            l["s2"] = "s2"
+            l["s3"] = "s3"
+            # s4 is further from home than s3 at slot 7, so it takes slot 7 and s3 moves on
+            l["s4"] = "s4"
+            self.assertEqual([l.table[i][0] for i in range(5, 9)], ["s1", "s2", "s4", "s3"])
+            # s4 stepped over three slots, though it was placed two from home
+            self.assertEqual(l.statistics(), (3, 5, 3))
+            self.assertEqual(l.displacement_max, 2)
+            # Finding s3, two slots from home, counts its two steps
+            self.assertEqual(l["s3"], "s3")
+            self.assertEqual(l.statistics(), (3, 7, 3))
+
+            # Deleting s2 shifts s4 and s3 back, leaving no tombstone
+            del l["s2"]
+            self.assertEqual([l.table[i][0] for i in range(5, 8)], ["s1", "s4", "s3"])
+            self.assertIsNone(l.table[8])
+            self.assertEqual(len(l), 3)
+            self.assertFalse("s2" in l)
+            self.assertRaises(KeyError, l.__delitem__, "s2")
+        finally:
+            RobinHoodPotionTable.hash = saved
+
+    def test_growth(self):
+        l = RobinHoodPotionTable(2, True, 5)
+        names = ["Potion of " + str(x) for x in range(40)]
+        for i, name in enumerate(names):
+            l[name] = i
+            self.assertEqual(len(l), i + 1)
+        l[names[0]] = "updated"
+        self.assertEqual(len(l), 40)
+        self.assertEqual(l[names[0]], "updated")
+        self.assertTrue(all(l[name] == i for i, name in enumerate(names) if i > 0))
+        self.assertFalse("Potion of 40" in l)
+        self.assertGreaterEqual(l.table_size, 80)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestRobinHoodTable)
+    unittest.TextTestRunner(verbosity=0).run(suite)